@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Protocol
+
+
+DEFAULT_TTL_SECONDS = 6 * 3600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Vendor catalogs change slowly; listing pages can be reused for a day
+DEFAULT_PROVIDER_TTLS: Dict[str, float] = {
+	"abcam": 24 * 3600.0,
+}
+
+
+def default_cache_dir() -> Path:
+	base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+	return Path(base).expanduser() / "absearch"
+
+
+@dataclass
+class CachedResponse:
+	body: str
+	etag: Optional[str] = None
+	last_modified: Optional[str] = None
+	stored_at: float = 0.0
+
+	def conditional_headers(self) -> Dict[str, str]:
+		headers: Dict[str, str] = {}
+		if self.etag:
+			headers["If-None-Match"] = self.etag
+		if self.last_modified:
+			headers["If-Modified-Since"] = self.last_modified
+		return headers
+
+
+class ResponseCache(Protocol):
+	"""Storage for fetched pages, keyed by provider namespace and URL.
+
+	The namespace is the provider name, optionally suffixed with a fetch mode
+	(``abcam:headless``) so rendered and raw HTML are cached separately.
+	"""
+
+	def get(self, namespace: str, url: str) -> Optional[CachedResponse]:
+		...
+
+	def is_fresh(self, namespace: str, entry: CachedResponse) -> bool:
+		...
+
+	def put(self, namespace: str, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+		...
+
+	def mark_revalidated(self, namespace: str, url: str) -> None:
+		...
+
+
+class SQLiteResponseCache:
+	"""Response cache in a single SQLite file with per-provider TTLs and LRU eviction.
+
+	Entries older than their provider's TTL are stale but kept, so their
+	ETag/Last-Modified validators can still be used for conditional requests.
+	``refresh=True`` treats every entry as stale. When the stored bodies exceed
+	``max_bytes`` the least recently used entries are evicted.
+	"""
+
+	def __init__(
+		self,
+		directory: Path | str | None = None,
+		max_bytes: int = DEFAULT_MAX_BYTES,
+		ttls: Optional[Dict[str, float]] = None,
+		default_ttl: float = DEFAULT_TTL_SECONDS,
+		refresh: bool = False,
+	) -> None:
+		path = Path(directory) if directory is not None else default_cache_dir()
+		path.mkdir(parents=True, exist_ok=True)
+		self.path = path / "responses.sqlite3"
+		self._max_bytes = max_bytes
+		self._ttls = dict(DEFAULT_PROVIDER_TTLS)
+		self._ttls.update(ttls or {})
+		self._default_ttl = default_ttl
+		self._refresh = refresh
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		self._conn.execute(
+			"CREATE TABLE IF NOT EXISTS responses ("
+			" namespace TEXT NOT NULL,"
+			" url TEXT NOT NULL,"
+			" body TEXT NOT NULL,"
+			" etag TEXT,"
+			" last_modified TEXT,"
+			" stored_at REAL NOT NULL,"
+			" accessed_at REAL NOT NULL,"
+			" size INTEGER NOT NULL,"
+			" PRIMARY KEY (namespace, url))"
+		)
+		self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+		self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+	def ttl_for(self, namespace: str) -> float:
+		provider = namespace.partition(":")[0].lower()
+		return self._ttls.get(provider, self._default_ttl)
+
+	def get(self, namespace: str, url: str) -> Optional[CachedResponse]:
+		with self._lock:
+			row = self._conn.execute(
+				"SELECT body, etag, last_modified, stored_at FROM responses WHERE namespace = ? AND url = ?",
+				(namespace, url),
+			).fetchone()
+			if row is None:
+				return None
+			self._conn.execute(
+				"UPDATE responses SET accessed_at = ? WHERE namespace = ? AND url = ?",
+				(time.time(), namespace, url),
+			)
+		return CachedResponse(body=row[0], etag=row[1], last_modified=row[2], stored_at=row[3])
+
+	def is_fresh(self, namespace: str, entry: CachedResponse) -> bool:
+		if self._refresh:
+			return False
+		return time.time() - entry.stored_at < self.ttl_for(namespace)
+
+	def put(self, namespace: str, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+		size = len(body.encode("utf-8"))
+		if size > self._max_bytes:
+			return
+		now = time.time()
+		with self._lock:
+			old = self._conn.execute(
+				"SELECT size FROM responses WHERE namespace = ? AND url = ?", (namespace, url)
+			).fetchone()
+			self._conn.execute(
+				"INSERT OR REPLACE INTO responses"
+				" (namespace, url, body, etag, last_modified, stored_at, accessed_at, size)"
+				" VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+				(namespace, url, body, etag, last_modified, now, now, size),
+			)
+			self._total_bytes += size - (old[0] if old else 0)
+			self._evict()
+
+	def mark_revalidated(self, namespace: str, url: str) -> None:
+		now = time.time()
+		with self._lock:
+			self._conn.execute(
+				"UPDATE responses SET stored_at = ?, accessed_at = ? WHERE namespace = ? AND url = ?",
+				(now, now, namespace, url),
+			)
+
+	def _evict(self) -> None:
+		while self._total_bytes > self._max_bytes:
+			rows = self._conn.execute(
+				"SELECT namespace, url, size FROM responses ORDER BY accessed_at LIMIT 64"
+			).fetchall()
+			if not rows:
+				self._total_bytes = 0
+				return
+			for namespace, url, size in rows:
+				self._conn.execute("DELETE FROM responses WHERE namespace = ? AND url = ?", (namespace, url))
+				self._total_bytes -= size
+				if self._total_bytes <= self._max_bytes:
+					return
+
+	def close(self) -> None:
+		with self._lock:
+			self._conn.close()
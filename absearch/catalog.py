@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .cache import default_cache_dir
+from .ordering import derived
+from .models import AntibodyRecord, AnyRecord, Criteria, promote
+
+
+_SCHEMA = [
+	"CREATE TABLE IF NOT EXISTS records ("
+	" id INTEGER PRIMARY KEY,"
+	" vendor TEXT NOT NULL,"
+	" catalog_number TEXT NOT NULL,"
+	" target TEXT NOT NULL,"
+	" host_species TEXT,"
+	" clonality TEXT,"
+	" conjugation TEXT,"
+	" citations_count INTEGER,"
+	" price REAL,"
+	" amount_ug REAL,"
+	" data TEXT NOT NULL,"
+	" harvested_at REAL NOT NULL,"
+	" UNIQUE (vendor, catalog_number))",
+	"CREATE TABLE IF NOT EXISTS record_reactivity (record_id INTEGER NOT NULL, value TEXT NOT NULL)",
+	"CREATE INDEX IF NOT EXISTS record_reactivity_value ON record_reactivity (value, record_id)",
+	"CREATE TABLE IF NOT EXISTS record_applications (record_id INTEGER NOT NULL, value TEXT NOT NULL)",
+	"CREATE INDEX IF NOT EXISTS record_applications_value ON record_applications (value, record_id)",
+	"CREATE INDEX IF NOT EXISTS records_host ON records (host_species)",
+	"CREATE INDEX IF NOT EXISTS records_clonality ON records (clonality)",
+	"CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(name, target, clone, applications)",
+	"CREATE TABLE IF NOT EXISTS pages ("
+	" provider TEXT NOT NULL,"
+	" target TEXT NOT NULL,"
+	" url TEXT NOT NULL,"
+	" body_hash TEXT,"
+	" etag TEXT,"
+	" last_modified TEXT,"
+	" catalogs TEXT NOT NULL,"
+	" fetched_at REAL NOT NULL,"
+	" PRIMARY KEY (provider, target, url))",
+]
+
+
+@dataclass
+class PageState:
+	"""What the last refresh saw at one listing URL."""
+
+	body_hash: Optional[str]
+	etag: Optional[str]
+	last_modified: Optional[str]
+	# (vendor, catalog_number) pairs listed on the page
+	catalogs: List[Tuple[str, str]]
+
+
+def default_catalog_path() -> Path:
+	return default_cache_dir() / "catalog.sqlite3"
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+	return value.lower() if value is not None else None
+
+
+def _fts_query(text: str) -> str:
+	# Quote every token so FTS5 syntax characters in gene names (e.g. "HLA-DR") are literal
+	tokens = re.findall(r"\w+", text)
+	return " ".join(f'"{t}"' for t in tokens)
+
+
+class CatalogStore:
+	"""Local SQLite catalog of harvested antibody records.
+
+	Records are keyed by vendor and catalog number and stored as JSON, with the
+	filterable fields copied into indexed columns (lowercased, as ``filter_records``
+	compares them) and side tables for reactivity and applications. An FTS5 index
+	over name, target, clone and applications answers target lookups, so a query
+	plus ``Criteria`` is a single SQL statement with the same semantics as
+	``filter_records``.
+	"""
+
+	def __init__(self, path: Path | str | None = None) -> None:
+		self.path = Path(path) if path is not None else default_catalog_path()
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		with self._conn:
+			for statement in _SCHEMA:
+				self._conn.execute(statement)
+
+	def __len__(self) -> int:
+		with self._lock:
+			return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+	def upsert(self, records: Iterable[AnyRecord]) -> int:
+		"""Insert or replace records; returns how many were written."""
+		now = time.time()
+		count = 0
+		with self._lock, self._conn:
+			for record in records:
+				record = promote(record)
+				self._write(record, now)
+				count += 1
+		return count
+
+	def _write(self, record: AntibodyRecord, harvested_at: float) -> int:
+		row = self._conn.execute(
+			"SELECT id FROM records WHERE vendor = ? AND catalog_number = ?",
+			(record.vendor, record.catalog_number),
+		).fetchone()
+		values = (
+			record.target,
+			_lower(record.host_species),
+			_lower(record.clonality),
+			_lower(record.conjugation),
+			record.citations_count,
+			record.price,
+			derived(record).amount_ug,
+			record.model_dump_json(),
+			harvested_at,
+		)
+		if row is None:
+			record_id = self._conn.execute(
+				"INSERT INTO records (target, host_species, clonality, conjugation, citations_count,"
+				" price, amount_ug, data, harvested_at, vendor, catalog_number)"
+				" VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+				values + (record.vendor, record.catalog_number),
+			).lastrowid
+		else:
+			record_id = row[0]
+			self._conn.execute(
+				"UPDATE records SET target = ?, host_species = ?, clonality = ?, conjugation = ?,"
+				" citations_count = ?, price = ?, amount_ug = ?, data = ?, harvested_at = ?"
+				" WHERE id = ?",
+				values + (record_id,),
+			)
+			self._conn.execute("DELETE FROM record_reactivity WHERE record_id = ?", (record_id,))
+			self._conn.execute("DELETE FROM record_applications WHERE record_id = ?", (record_id,))
+			self._conn.execute("DELETE FROM records_fts WHERE rowid = ?", (record_id,))
+
+		self._conn.executemany(
+			"INSERT INTO record_reactivity (record_id, value) VALUES (?, ?)",
+			[(record_id, v) for v in set(x.lower() for x in record.validated_reactivity)],
+		)
+		self._conn.executemany(
+			"INSERT INTO record_applications (record_id, value) VALUES (?, ?)",
+			[(record_id, v) for v in set(x.lower() for x in record.applications)],
+		)
+		self._conn.execute(
+			"INSERT INTO records_fts (rowid, name, target, clone, applications) VALUES (?, ?, ?, ?, ?)",
+			(record_id, record.name, record.target, record.clone or "", " ".join(record.applications)),
+		)
+		return record_id
+
+	def delete(self, keys: Iterable[Tuple[str, str]]) -> int:
+		"""Remove records by (vendor, catalog_number); returns how many existed."""
+		count = 0
+		with self._lock, self._conn:
+			for vendor, catalog_number in keys:
+				row = self._conn.execute(
+					"SELECT id FROM records WHERE vendor = ? AND catalog_number = ?", (vendor, catalog_number)
+				).fetchone()
+				if row is None:
+					continue
+				for table, column in (
+					("record_reactivity", "record_id"),
+					("record_applications", "record_id"),
+					("records_fts", "rowid"),
+					("records", "id"),
+				):
+					self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (row[0],))
+				count += 1
+		return count
+
+	def records(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], AntibodyRecord]:
+		"""Stored records for the given (vendor, catalog_number) keys that exist."""
+		found: Dict[Tuple[str, str], AntibodyRecord] = {}
+		with self._lock:
+			for vendor, catalog_number in keys:
+				row = self._conn.execute(
+					"SELECT data FROM records WHERE vendor = ? AND catalog_number = ?",
+					(vendor, catalog_number),
+				).fetchone()
+				if row is not None:
+					found[(vendor, catalog_number)] = AntibodyRecord.model_validate_json(row[0])
+		return found
+
+	def page_states(self, provider: str, target: str) -> Dict[str, PageState]:
+		with self._lock:
+			rows = self._conn.execute(
+				"SELECT url, body_hash, etag, last_modified, catalogs FROM pages WHERE provider = ? AND target = ?",
+				(provider, target),
+			).fetchall()
+		return {
+			url: PageState(body_hash, etag, last_modified, [tuple(pair) for pair in json.loads(catalogs)])
+			for url, body_hash, etag, last_modified, catalogs in rows
+		}
+
+	def save_page_states(self, provider: str, target: str, states: Dict[str, PageState]) -> None:
+		"""Replace the stored page states of ``provider`` for ``target``."""
+		now = time.time()
+		with self._lock, self._conn:
+			self._conn.execute("DELETE FROM pages WHERE provider = ? AND target = ?", (provider, target))
+			for url, state in states.items():
+				self._conn.execute(
+					"INSERT OR REPLACE INTO pages"
+					" (provider, target, url, body_hash, etag, last_modified, catalogs, fetched_at)"
+					" VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+					(provider, target, url, state.body_hash, state.etag, state.last_modified, json.dumps(state.catalogs), now),
+				)
+
+	def unlisted(self, keys: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
+		"""The given (vendor, catalog_number) keys that no stored page state of any target lists."""
+		with self._lock:
+			rows = self._conn.execute("SELECT catalogs FROM pages").fetchall()
+		listed = {tuple(pair) for (catalogs,) in rows for pair in json.loads(catalogs)}
+		return [key for key in keys if tuple(key) not in listed]
+
+	def _criteria_sql(self, criteria: Criteria) -> Tuple[List[str], List[object]]:
+		clauses: List[str] = []
+		params: List[object] = []
+
+		def _in(values: List[str]) -> str:
+			params.extend(values)
+			return ", ".join("?" for _ in values)
+
+		if criteria.species_reactivity:
+			values = sorted(set(x.lower() for x in criteria.species_reactivity))
+			clauses.append(
+				"EXISTS (SELECT 1 FROM record_reactivity rr WHERE rr.record_id = r.id"
+				f" AND rr.value IN ({_in(values)}))"
+			)
+		for column, wanted in (
+			("host_species", criteria.host_species),
+			("clonality", criteria.clonality),
+			("conjugation", criteria.conjugation),
+		):
+			if wanted:
+				values = sorted(set(x.lower() for x in wanted))
+				clauses.append(f"r.{column} IN ({_in(values)})")
+		if criteria.applications:
+			for value in sorted(set(x.lower() for x in criteria.applications)):
+				clauses.append(
+					"EXISTS (SELECT 1 FROM record_applications ra WHERE ra.record_id = r.id AND ra.value = ?)"
+				)
+				params.append(value)
+		if criteria.min_citations is not None:
+			clauses.append("r.citations_count IS NOT NULL AND r.citations_count >= ?")
+			params.append(criteria.min_citations)
+		if criteria.max_price is not None:
+			clauses.append("(r.price IS NULL OR r.price <= ?)")
+			params.append(criteria.max_price)
+		if criteria.min_amount_ug is not None:
+			clauses.append("r.amount_ug IS NOT NULL AND r.amount_ug >= ?")
+			params.append(criteria.min_amount_ug)
+		return clauses, params
+
+	def search(self, target: str, criteria: Optional[Criteria] = None) -> List[AntibodyRecord]:
+		"""Records matching ``target`` by full-text search and satisfying ``criteria``."""
+		query = _fts_query(target)
+		if not query:
+			return []
+		clauses, params = self._criteria_sql(criteria or Criteria())
+		sql = (
+			"SELECT r.data FROM records_fts f JOIN records r ON r.id = f.rowid"
+			" WHERE records_fts MATCH ?"
+		)
+		for clause in clauses:
+			sql += f" AND {clause}"
+		sql += " ORDER BY r.id"
+		with self._lock:
+			rows = self._conn.execute(sql, [query] + params).fetchall()
+		return [AntibodyRecord.model_validate_json(data) for (data,) in rows]
+
+	def close(self) -> None:
+		with self._lock:
+			self._conn.close()
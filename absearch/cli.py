@@ -1,93 +1,339 @@
 from __future__ import annotations
 
+import csv
 import json
-from typing import List, Optional
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import typer
 from rich import box
 from rich.console import Console
+from rich.segment import Segments
 from rich.table import Table
 
-from .filters import filter_records
-from .models import Criteria
-from .search import get_providers, search_all_sync
-from .ordering import sort_records_by_priority, normalize_applications
-from .selection import pick_best_package
+from . import profiling
+from .cache import SQLiteResponseCache, default_cache_dir
+from .endpoints import EndpointMemory
+from .catalog import CatalogStore, default_catalog_path
+from .client import ServerError, ServerUnavailable, remote_search, server_address
+from .filters import filter_records, record_matches_criteria
+from .models import AntibodyRecord, AnyRecord, Criteria, Derived, TargetResult, promote
+from .parsing import ParseExecutor, default_parse_workers
+from .providers.base import DEFAULT_MAX_PAGES
+from .search import (
+	DEFAULT_DETAIL_CONCURRENCY,
+	DEFAULT_MAX_CONCURRENCY,
+	DEFAULT_PER_PROVIDER_CONCURRENCY,
+	DEFAULT_PROVIDER_TIMEOUT,
+	RecordSink,
+	get_providers,
+	search_many_sync,
+)
+from .refresh import TargetDelta, refresh_many_sync
+from .ordering import derived, sort_records_by_priority, top_k_by_priority
+from .profiling import span
 
 console = Console()
+err_console = Console(stderr=True)
 
+_CSV_FIELDS = list(AntibodyRecord.model_fields)
 
-def _render_table(records) -> None:
-	table = Table(show_lines=False, box=box.SIMPLE_HEAVY)
-	table.add_column("Vendor", style="bold")
-	table.add_column("Catalog")
-	table.add_column("Name")
-	table.add_column("Target")
-	table.add_column("Host")
-	table.add_column("Clonality")
-	table.add_column("Clone")
-	table.add_column("Apps")
-	table.add_column("Reactivity")
-	table.add_column("Conj")
-	table.add_column("Formulation")
-	table.add_column("BSA-free")
-	table.add_column("Gelatin-free")
-	table.add_column("Ascites-free")
-	table.add_column("Amount (ug)")
-	table.add_column("Conc (mg/mL)")
-	table.add_column("Vol (uL)")
-	table.add_column("Best Amount (ug)")
-	table.add_column("Best Price")
-	table.add_column("Citations")
 
+def _yes_no(flag: Optional[bool]) -> str:
+	return "Yes" if flag else ("No" if flag is not None else "")
+
+
+def _money(amount: Optional[float], currency: Optional[str]) -> str:
+	return "" if amount is None else f"{amount:.2f} {currency or ''}".strip()
+
+
+# Table columns by --columns key: header and cell text from a record and its derived fields
+_COLUMNS: Dict[str, Tuple[str, Callable[[AnyRecord, Derived], str]]] = {
+	"vendor": ("Vendor", lambda r, d: r.vendor),
+	"catalog": ("Catalog", lambda r, d: r.catalog_number),
+	"name": ("Name", lambda r, d: r.name),
+	"target": ("Target", lambda r, d: r.target),
+	"host": ("Host", lambda r, d: r.host_species or ""),
+	"clonality": ("Clonality", lambda r, d: r.clonality or ""),
+	"clone": ("Clone", lambda r, d: r.clone or ""),
+	"apps": ("Apps", lambda r, d: ",".join(d.application_codes)),
+	"reactivity": ("Reactivity", lambda r, d: ",".join(r.validated_reactivity)),
+	"conj": ("Conj", lambda r, d: r.conjugation or ""),
+	"formulation": ("Formulation", lambda r, d: r.formulation or ""),
+	"bsa-free": ("BSA-free", lambda r, d: _yes_no(r.is_bsa_free)),
+	"gelatin-free": ("Gelatin-free", lambda r, d: _yes_no(r.is_gelatin_free)),
+	"ascites-free": ("Ascites-free", lambda r, d: _yes_no(r.is_ascites_free)),
+	"amount": ("Amount (ug)", lambda r, d: "" if r.amount_ug is None else f"{r.amount_ug:.0f}"),
+	"conc": ("Conc (mg/mL)", lambda r, d: "" if r.concentration_mg_per_ml is None else f"{r.concentration_mg_per_ml:g}"),
+	"vol": ("Vol (uL)", lambda r, d: "" if r.volume_ul is None else f"{r.volume_ul:g}"),
+	"best-amount": ("Best Amount (ug)", lambda r, d: "" if d.best_package is None else f"{d.best_package[0]:.0f}"),
+	"best-price": ("Best Price", lambda r, d: "" if d.best_package is None else _money(d.best_package[1], d.best_package[2])),
+	"citations": ("Citations", lambda r, d: "" if r.citations_count is None else str(r.citations_count)),
+}
+
+# Rows per table when output is not an interactive terminal
+DEFAULT_CHUNK_ROWS = 100
+
+
+def _parse_columns(values: Optional[List[str]]) -> List[str]:
+	if not values:
+		return list(_COLUMNS)
+	keys = [key.strip().lower() for value in values for key in value.split(",") if key.strip()]
+	unknown = [key for key in keys if key not in _COLUMNS]
+	if unknown:
+		raise typer.BadParameter(f"Unknown column(s) {', '.join(unknown)}; choose from {', '.join(_COLUMNS)}")
+	return keys
+
+
+def _build_table(records: Sequence[AnyRecord], columns: Sequence[str]) -> Table:
+	table = Table(show_lines=False, box=box.SIMPLE_HEAVY)
+	for key in columns:
+		table.add_column(_COLUMNS[key][0], style="bold" if key == "vendor" else None)
+	cells = [_COLUMNS[key][1] for key in columns]
 	for r in records:
-		price_str = "" if r.price is None else f"{r.price:.2f} {r.currency or ''}".strip()
-		apps_str = ",".join(normalize_applications(r.applications))
-		react_str = ",".join(r.validated_reactivity)
-		cit_str = "" if r.citations_count is None else str(r.citations_count)
-		bsa_str = "Yes" if r.is_bsa_free else ("No" if r.is_bsa_free is not None else "")
-		gel_str = "Yes" if r.is_gelatin_free else ("No" if r.is_gelatin_free is not None else "")
-		asc_str = "Yes" if r.is_ascites_free else ("No" if r.is_ascites_free is not None else "")
-		form_str = r.formulation or ""
-		amt_str = "" if r.amount_ug is None else f"{r.amount_ug:.0f}"
-		conc_str = "" if r.concentration_mg_per_ml is None else f"{r.concentration_mg_per_ml:g}"
-		vol_str = "" if r.volume_ul is None else f"{r.volume_ul:g}"
-
-		best = pick_best_package(r)
-		best_amt_str = best_price_str = ""
-		if best is not None:
-			best_amt, best_price, best_currency, _ = best
-			best_amt_str = f"{best_amt:.0f}"
-			best_price_str = f"{best_price:.2f} {best_currency or ''}".strip()
-
-		table.add_row(
-			r.vendor,
-			r.catalog_number,
-			r.name,
-			r.target,
-			r.host_species or "",
-			r.clonality or "",
-			r.clone or "",
-			apps_str,
-			react_str,
-			r.conjugation or "",
-			form_str,
-			bsa_str,
-			gel_str,
-			asc_str,
-			amt_str,
-			conc_str,
-			vol_str,
-			best_amt_str,
-			best_price_str,
-			cit_str,
+		d = derived(r)
+		table.add_row(*(cell(r, d) for cell in cells))
+	return table
+
+
+def _interactive() -> bool:
+	return console.is_terminal and sys.stdin.isatty()
+
+
+def _render_table(records, columns: Optional[Sequence[str]] = None, page_size: Optional[int] = None) -> None:
+	"""Show records as tables, formatting only the rows about to be shown.
+
+	On an interactive terminal results longer than a screen open in a pager;
+	otherwise they are printed ``page_size`` rows (default ``DEFAULT_CHUNK_ROWS``)
+	per table, so output starts as soon as the first chunk is formatted.
+	"""
+	columns = list(columns or _COLUMNS)
+	with span("render.table", rows=len(records), columns=len(columns)) as sp:
+		if _interactive() and len(records) > (page_size or console.height):
+			sp.set(paged=True)
+			_page_table(records, columns, page_size)
+		else:
+			_print_table(records, columns, page_size or DEFAULT_CHUNK_ROWS)
+
+
+def _print_table(records, columns: Sequence[str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+	if not records:
+		console.print(_build_table([], columns))
+	for start in range(0, len(records), chunk_rows):
+		console.print(_build_table(records[start:start + chunk_rows], columns))
+
+
+def _fit_page(records, columns: Sequence[str], start: int, page_size: Optional[int]) -> Tuple[int, List]:
+	"""Format the page starting at ``start``; returns its row count and rendered lines.
+
+	Without a fixed ``page_size`` rows are dropped until the table fits the
+	screen, since long names and formulations wrap onto several lines.
+	"""
+	height = max(console.height - 2, 5)
+	rows = page_size or height
+	while True:
+		table = _build_table(records[start:start + rows], columns)
+		lines = console.render_lines(table, console.options, pad=False, new_lines=True)
+		if page_size or rows == 1 or len(lines) <= height:
+			return rows, lines
+		rows = max(1, min(rows - 1, rows * height // len(lines)))
+
+
+def _page_table(records, columns: Sequence[str], page_size: Optional[int] = None) -> None:
+	total = len(records)
+	starts = [0]
+	while True:
+		start = starts[-1]
+		rows, lines = _fit_page(records, columns, start, page_size)
+		end = min(start + rows, total)
+		console.clear()
+		for line in lines:
+			console.print(Segments(line), end="")
+		answer = console.input(
+			f"[dim]rows {start + 1}-{end} of {total} · Enter/n next · p previous · g first · q quit[/dim] "
+		).strip().lower()
+		if answer in ("q", "quit"):
+			return
+		if answer == "p":
+			if len(starts) > 1:
+				starts.pop()
+		elif answer == "g":
+			starts = [0]
+		elif end < total:
+			starts.append(end)
+		else:
+			return
+
+
+def _read_targets(targets_file: str) -> List[str]:
+	if targets_file == "-":
+		lines = sys.stdin.read().splitlines()
+	else:
+		lines = Path(targets_file).read_text().splitlines()
+	targets = [line.split("#", 1)[0].strip() for line in lines]
+	return list(dict.fromkeys(t for t in targets if t))
+
+
+def _write_csv(csv_out: str, records) -> None:
+	path = Path(csv_out)
+	with path.open("w", newline="") as f:
+		writer = csv.DictWriter(f, fieldnames=_CSV_FIELDS)
+		writer.writeheader()
+		for r in records:
+			writer.writerow(promote(r).model_dump(mode="json"))
+		console.print(f"Wrote {len(records)} records to {path}")
+
+
+def _stream_output(search, criteria: Criteria, ndjson: bool, csv_out: Optional[str]) -> None:
+	"""Run ``search(on_record)`` and write matching records the moment they arrive."""
+	written = 0
+	csv_file = Path(csv_out).open("w", newline="") if csv_out else None
+	writer = csv.DictWriter(csv_file, fieldnames=_CSV_FIELDS) if csv_file else None
+	if writer is not None:
+		writer.writeheader()
+
+	def _on_record(record: AnyRecord) -> None:
+		nonlocal written
+		if not record_matches_criteria(record, criteria):
+			return
+		record = promote(record)
+		if ndjson:
+			sys.stdout.write(record.model_dump_json() + "\n")
+			sys.stdout.flush()
+		if writer is not None:
+			writer.writerow(record.model_dump(mode="json"))
+			csv_file.flush()
+		written += 1
+
+	try:
+		results = search(_on_record)
+	except BrokenPipeError:
+		# The reader went away (e.g. piped into head); the search has been cancelled
+		os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+		raise typer.Exit(code=1)
+	finally:
+		if csv_file is not None:
+			csv_file.close()
+
+	for target, result in results.items():
+		for name, status in result.provider_status.items():
+			if status != "ok":
+				err_console.print(f"[yellow]{target} / {name}: {status}[/yellow]")
+	if csv_out:
+		err_console.print(f"Wrote {written} records to {csv_out}")
+
+
+def _catalog_search(
+	store: CatalogStore,
+	targets: List[str],
+	criteria: Criteria,
+	on_record: Optional[RecordSink] = None,
+	limit: Optional[int] = None,
+) -> Dict[str, TargetResult]:
+	results: Dict[str, TargetResult] = {}
+	for target in targets:
+		with span("catalog.search", target=target):
+			records = store.search(target, criteria)
+		if limit is not None:
+			records = top_k_by_priority(records, limit)
+		if on_record is not None:
+			for r in records:
+				on_record(r)
+			records = []
+		results[target] = TargetResult(target=target, records=records, provider_status={"catalog": "ok"})
+	return results
+
+
+def _output_deltas(
+	deltas: Dict[str, TargetDelta],
+	json_out: bool,
+	columns: Optional[Sequence[str]] = None,
+	page_size: Optional[int] = None,
+) -> None:
+	if json_out:
+		console.print_json(data={
+			target: {
+				"added": [r.model_dump(mode="json") for r in delta.added],
+				"changed": [r.model_dump(mode="json") for r in delta.changed],
+				"removed": [{"vendor": v, "catalog_number": c} for v, c in delta.removed],
+				"pages": {
+					"parsed": delta.pages_parsed,
+					"unchanged": delta.pages_unchanged,
+					"failed": delta.pages_failed,
+				},
+				"provider_status": delta.provider_status,
+			}
+			for target, delta in deltas.items()
+		})
+		return
+
+	for target, delta in deltas.items():
+		console.rule(
+			f"{target}: +{len(delta.added)} ~{len(delta.changed)} -{len(delta.removed)}"
+			f" ({delta.pages_parsed} pages parsed, {delta.pages_unchanged} unchanged, {delta.pages_failed} failed)"
 		)
+		for name, status in delta.provider_status.items():
+			if status != "ok":
+				console.print(f"[yellow]{name}: {status}[/yellow]")
+		if delta.added or delta.changed:
+			_render_table(delta.added + delta.changed, columns, page_size)
+		for vendor, catalog_number in delta.removed:
+			console.print(f"[red]removed[/red] {vendor} {catalog_number}")
+
+
+def _rank(records: List[AnyRecord], limit: Optional[int], **attrs) -> List[AnyRecord]:
+	with span("sort", records=len(records), limit=limit, **attrs):
+		if limit is None:
+			return sort_records_by_priority(records)
+		return top_k_by_priority(records, limit)
+
+
+def _output_batch(
+	results: Dict[str, TargetResult],
+	criteria: Criteria,
+	json_out: bool,
+	csv_out: Optional[str],
+	limit: Optional[int] = None,
+	columns: Optional[Sequence[str]] = None,
+	page_size: Optional[int] = None,
+) -> None:
+	ranked = {}
+	for target, result in results.items():
+		ranked[target] = _rank(filter_records(result.records, criteria), limit, target=target)
 
-	console.print(table)
+	if json_out:
+		with span("output.json"):
+			console.print_json(data={
+				target: {
+					"status": result.status,
+					"provider_status": result.provider_status,
+					"records": [promote(r).model_dump(mode="json") for r in ranked[target]],
+				}
+				for target, result in results.items()
+			})
+		return
+
+	if csv_out:
+		with span("output.csv"):
+			_write_csv(csv_out, [r for records in ranked.values() for r in records])
+
+	for target, result in results.items():
+		if limit is not None:
+			console.rule(f"{target}: {result.status}, best {len(ranked[target])} matching records")
+		else:
+			console.rule(f"{target}: {result.status}, {len(ranked[target])} of {len(result.records)} records match")
+		for name, status in result.provider_status.items():
+			if status != "ok":
+				console.print(f"[yellow]{name}: {status}[/yellow]")
+		if not csv_out:
+			_render_table(ranked[target], columns, page_size)
 
 
 def main(
-	target: str = typer.Argument(..., help="Protein or gene name to search for (e.g., TP53)"),
+	target: Optional[str] = typer.Argument(None, help="Protein or gene name to search for (e.g., TP53)"),
+	targets_file: Optional[str] = typer.Option(None, "--targets-file", help="Batch mode: file with one target per line ('-' reads stdin)"),
 	applications: Optional[List[str]] = typer.Option(None, "--applications", help="Required applications, e.g., WB IHC IF"),
 	clonality: Optional[List[str]] = typer.Option(None, "--clonality", help="Monoclonal/Polyclonal"),
 	host_species: Optional[List[str]] = typer.Option(None, "--host-species", help="Required host species (Rabbit, Mouse, etc.)"),
@@ -96,64 +342,202 @@ def main(
 	min_citations: Optional[int] = typer.Option(None, "--min-citations", help="Minimum number of citations"),
 	max_price: Optional[float] = typer.Option(None, "--max-price", help="Maximum price in vendor currency"),
 	min_amount_ug: Optional[float] = typer.Option(10.0, "--min-amount-ug", help="Minimum amount of antibody in micrograms (default: 10)"),
-	providers: Optional[List[str]] = typer.Option(None, "--providers", help="Provider names (default: abcam). Options: abcam, mock. Suffix ':headless' to enable headless for abcam."),
+	providers: Optional[List[str]] = typer.Option(None, "--providers", help="Provider names (default: abcam). Built in: abcam, mock; others via the 'absearch.providers' entry point group. Suffix ':headless' to enable headless for abcam."),
 	headless: bool = typer.Option(False, "--headless", help="Enable headless browser rendering for supported providers"),
+	timeout: float = typer.Option(DEFAULT_PROVIDER_TIMEOUT, "--timeout", help="Per-provider timeout in seconds"),
+	max_concurrency: int = typer.Option(DEFAULT_MAX_CONCURRENCY, "--max-concurrency", help="Maximum number of provider queries in flight at once"),
+	per_provider_concurrency: int = typer.Option(DEFAULT_PER_PROVIDER_CONCURRENCY, "--per-provider-concurrency", help="Batch mode: maximum concurrent queries per provider"),
+	no_enrich: bool = typer.Option(False, "--no-enrich", help="Skip fetching product pages for price, package sizes and citations"),
+	detail_concurrency: int = typer.Option(DEFAULT_DETAIL_CONCURRENCY, "--detail-concurrency", help="Maximum product pages fetched at once per provider"),
+	max_pages: Optional[int] = typer.Option(None, "--max-pages", min=1, help=f"Listing pages to follow per search URL (default: {DEFAULT_MAX_PAGES})"),
+	parse_workers: Optional[int] = typer.Option(None, "--parse-workers", min=0, help=f"Processes parsing large pages in parallel; 0 parses on a thread (default: {default_parse_workers()} in batch and incremental runs, else 0)"),
+	cache_dir: Optional[str] = typer.Option(None, "--cache-dir", help=f"Directory for the HTTP response cache (default: {default_cache_dir()})"),
+	no_cache: bool = typer.Option(False, "--no-cache", help="Disable the HTTP response cache"),
+	refresh: bool = typer.Option(False, "--refresh", help="Revalidate cached responses with the vendor instead of reusing them"),
 	json_out: bool = typer.Option(False, "--json", help="Output JSON instead of table"),
 	csv_out: Optional[str] = typer.Option(None, "--csv", help="Write CSV to the given filepath"),
+	columns: Optional[List[str]] = typer.Option(None, "--columns", help=f"Table columns to show, comma separated or repeated (default: all). Choose from: {', '.join(_COLUMNS)}"),
+	page_size: Optional[int] = typer.Option(None, "--page-size", min=1, help=f"Table rows per page in the terminal pager, or per chunk when output is redirected (default: fit the screen / {DEFAULT_CHUNK_ROWS})"),
+	source: str = typer.Option("live", "--source", help="Where to look: 'live' queries vendors, 'catalog' queries the local harvested catalog"),
+	offline: bool = typer.Option(False, "--offline", help="Shorthand for --source catalog"),
+	harvest: bool = typer.Option(False, "--harvest", help="Store every record fetched from vendors in the local catalog"),
+	incremental: bool = typer.Option(False, "--incremental", help="Refresh the local catalog from vendors, skipping unchanged pages, and print only added/changed/removed records"),
+	catalog_path: Optional[str] = typer.Option(None, "--catalog", help=f"Path of the local catalog database (default: {default_catalog_path()})"),
+	ndjson: bool = typer.Option(False, "--ndjson", help="Stream matching records to stdout as NDJSON as providers return them (unsorted)"),
+	limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show only the K best-ranked records per target; enrichment skips records that cannot make the cut"),
+	stream: bool = typer.Option(False, "--stream", help="With --csv, write rows as providers return them instead of sorted at the end (implied by --ndjson)"),
+	no_server: bool = typer.Option(False, "--no-server", help="Search in this process even if an absearch server is running"),
+	profile: Optional[str] = typer.Option(None, "--profile", help="Write per-stage timings (fetch, render, parse, filter, sort, output) to this file"),
+	profile_format: str = typer.Option("json", "--profile-format", help="Profile format: 'json' summary and spans, or 'chrome' trace for chrome://tracing / Perfetto"),
 ):
 	"""Search antibody vendors and filter results by criteria."""
-	# Default species reactivity to Human if not provided
-	if not species_reactivity or len(species_reactivity) == 0:
-		species_reactivity = ["Human"]
-
-	criteria = Criteria(
-		applications=applications or None,
-		clonality=clonality or None,
-		host_species=host_species or None,
-		species_reactivity=species_reactivity or None,
-		conjugation=conjugation or None,
-		min_citations=min_citations,
-		max_price=max_price,
-		min_amount_ug=min_amount_ug,
-	)
-
-	provider_args = providers or ["abcam"]
-	if headless:
-		provider_args = [p if not p.lower().startswith("abcam") else "abcam:headless" for p in provider_args]
-		if providers is None:
-			provider_args = ["abcam:headless"]
-
-	provider_instances = get_providers(provider_args)
-	records: List = []
-	for p in provider_instances:
-		records.extend(search_all_sync(target, providers=[p]))
-
-	filtered = filter_records(records, criteria)
-
-	# Apply priority sorting with formulation bonuses and application priority
-	sorted_records = sort_records_by_priority(filtered)
+	if profile_format not in ("json", "chrome"):
+		raise typer.BadParameter("--profile-format must be 'json' or 'chrome'")
+	profiler = profiling.enable() if profile else None
+	try:
+		table_columns = _parse_columns(columns)
+		targets = _read_targets(targets_file) if targets_file is not None else []
+		if target:
+			targets.insert(0, target)
+		if not targets:
+			raise typer.BadParameter("Provide a TARGET argument or --targets-file")
 
-	if json_out:
-		console.print_json(data=[r.model_dump(mode="json") for r in sorted_records])
-		return
+		# Default species reactivity to Human if not provided
+		if not species_reactivity or len(species_reactivity) == 0:
+			species_reactivity = ["Human"]
 
-	if csv_out:
-		import csv
-		from pathlib import Path
-
-		path = Path(csv_out)
-		with path.open("w", newline="") as f:
-			writer = csv.DictWriter(
-				f,
-				fieldnames=list(sorted_records[0].model_dump(mode="json").keys()) if sorted_records else ["vendor", "catalog_number"],
+		criteria = Criteria(
+			applications=applications or None,
+			clonality=clonality or None,
+			host_species=host_species or None,
+			species_reactivity=species_reactivity or None,
+			conjugation=conjugation or None,
+			min_citations=min_citations,
+			max_price=max_price,
+			min_amount_ug=min_amount_ug,
+		)
+
+		provider_args = providers or ["abcam"]
+		if headless:
+			provider_args = [p if not p.lower().startswith("abcam") else "abcam:headless" for p in provider_args]
+			if providers is None:
+				provider_args = ["abcam:headless"]
+
+		if limit is not None and ndjson:
+			raise typer.BadParameter("--limit ranks records before printing and cannot be combined with --ndjson")
+		if limit is not None and stream and csv_out:
+			raise typer.BadParameter("--limit ranks records before writing and cannot be combined with --stream")
+
+		source = "catalog" if offline else source.lower()
+		if source not in ("live", "catalog"):
+			raise typer.BadParameter("--source must be 'live' or 'catalog'")
+		if incremental and source == "catalog":
+			raise typer.BadParameter("--incremental refreshes from live vendors and cannot be combined with --offline")
+		store = CatalogStore(catalog_path) if (source == "catalog" or harvest or incremental) else None
+		# Worker processes take a moment to start, which only pays off over many pages
+		if parse_workers is None:
+			parse_workers = default_parse_workers() if (targets_file is not None or incremental) else 0
+		parser = ParseExecutor(parse_workers)
+		# Learned listing URLs are kept beside the response cache and share its on/off switch
+		endpoints = None if no_cache else EndpointMemory(cache_dir or default_cache_dir())
+
+		if source == "catalog":
+			def run(on_record: Optional[RecordSink] = None) -> Dict[str, TargetResult]:
+				return _catalog_search(store, targets, criteria, on_record, limit)
+		else:
+			if incremental:
+				cache = None if no_cache else SQLiteResponseCache(cache_dir, refresh=refresh)
+				provider_instances = get_providers(provider_args, cache=cache, parser=parser, endpoints=endpoints, max_pages=max_pages)
+				deltas = refresh_many_sync(
+					store,
+					targets,
+					provider_instances,
+					max_concurrency=max_concurrency,
+					enrich=not no_enrich,
+					detail_concurrency=detail_concurrency,
+				)
+				_output_deltas(deltas, json_out, table_columns, page_size)
+				return
+
+			def run_local(on_record: Optional[RecordSink] = None) -> Dict[str, TargetResult]:
+				cache = None if no_cache else SQLiteResponseCache(cache_dir, refresh=refresh)
+				provider_instances = get_providers(provider_args, cache=cache, parser=parser, endpoints=endpoints, max_pages=max_pages)
+				harvested: List[AnyRecord] = []
+
+				def _harvest(record: AnyRecord) -> None:
+					harvested.append(record)
+					on_record(record)
+
+				sink = _harvest if store is not None and on_record is not None else on_record
+				results = search_many_sync(
+					targets,
+					providers=provider_instances,
+					timeout_seconds=timeout,
+					max_concurrency=max_concurrency,
+					per_provider_concurrency=per_provider_concurrency,
+					on_record=sink,
+					enrich=not no_enrich,
+					# Harvesting keeps every record, so only prefilter when not storing
+					criteria=criteria if store is None else None,
+					detail_concurrency=detail_concurrency,
+					limit=limit if store is None else None,
+				)
+				if profiler is not None:
+					profiler.annotate("fetch_hosts", {
+						p.name: p.metrics() for p in provider_instances if hasattr(p, "metrics")
+					})
+				if store is not None:
+					stored = store.upsert(harvested or [r for result in results.values() for r in result.records])
+					err_console.print(f"Harvested {stored} records into {store.path}")
+				return results
+
+			# The server applies its own timeout, concurrency and paging settings, so runs changing them stay local
+			tuned = max_pages is not None or (timeout, max_concurrency, per_provider_concurrency, detail_concurrency) != (
+				DEFAULT_PROVIDER_TIMEOUT,
+				DEFAULT_MAX_CONCURRENCY,
+				DEFAULT_PER_PROVIDER_CONCURRENCY,
+				DEFAULT_DETAIL_CONCURRENCY,
 			)
-			writer.writeheader()
-			for r in sorted_records:
-				writer.writerow(r.model_dump(mode="json"))
-			console.print(f"Wrote {len(sorted_records)} records to {path}")
-		return
+			# A running server has warm clients and caches; cache-bypassing and harvest runs stay local
+			address = None if (no_server or no_cache or refresh or store is not None or tuned) else server_address()
+			# Long enough for every wave of targets to hit the provider timeout, so a hung server cannot hang the CLI
+			remote_timeout = timeout * (2 + len(targets) // max(1, max_concurrency))
+
+			def run(on_record: Optional[RecordSink] = None) -> Dict[str, TargetResult]:
+				if address is None:
+					return run_local(on_record)
+				try:
+					with span("server.search", address=address):
+						results = remote_search(address, targets, criteria, provider_args, enrich=not no_enrich, timeout=remote_timeout, limit=limit)
+				except ServerError as exc:
+					err_console.print(f"[yellow]{exc}; searching locally[/yellow]")
+					return run_local(on_record)
+				except ServerUnavailable:
+					return run_local(on_record)
+				if on_record is not None:
+					for result in results.values():
+						for record in result.records:
+							on_record(record)
+						result.records = []
+				return results
+
+		if ndjson or (stream and csv_out):
+			_stream_output(run, criteria, ndjson, csv_out)
+			return
+
+		results = run()
+		if targets_file is not None:
+			_output_batch(results, criteria, json_out, csv_out, limit, table_columns, page_size)
+			return
+
+		result = results[targets[0]]
+		for name, status in result.provider_status.items():
+			if status != "ok":
+				err_console.print(f"[yellow]{name}: {status}[/yellow]")
+		if result.status == "failed":
+			raise typer.Exit(code=1)
+
+		filtered = filter_records(result.records, criteria)
+
+		# Apply priority sorting with formulation bonuses and application priority
+		sorted_records = _rank(filtered, limit)
+
+		if json_out:
+			with span("output.json"):
+				console.print_json(data=[promote(r).model_dump(mode="json") for r in sorted_records])
+			return
+
+		if csv_out:
+			with span("output.csv"):
+				_write_csv(csv_out, sorted_records)
+			return
 
-	_render_table(sorted_records)
+		_render_table(sorted_records, table_columns, page_size)
+	finally:
+		if profiler is not None:
+			profiling.disable()
+			profiler.write(profile, profile_format)
+			err_console.print(f"Wrote profile to {profile}")
 
 
 if __name__ == "__main__":
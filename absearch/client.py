@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import socket
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .cache import default_cache_dir
+from .models import AntibodyRecord, Criteria, TargetResult
+
+
+# ``unix:/path/to/server.sock`` or ``http://127.0.0.1:8765``
+SERVER_ENV = "ABSEARCH_SERVER"
+
+# Seconds to wait on a search before treating the server as unavailable
+DEFAULT_SEARCH_TIMEOUT = 300.0
+
+
+class ServerUnavailable(Exception):
+	pass
+
+
+class ServerError(ServerUnavailable):
+	"""The server answered but could not run the request."""
+
+	def __init__(self, message: str, status: int) -> None:
+		super().__init__(message)
+		self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+	def __init__(self, path: str, timeout: Optional[float] = None) -> None:
+		super().__init__("localhost", timeout=timeout)
+		self._path = path
+
+	def connect(self) -> None:
+		self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		if self.timeout is not None:
+			self.sock.settimeout(self.timeout)
+		self.sock.connect(self._path)
+
+
+def server_address() -> Optional[str]:
+	"""The server to forward to: ``$ABSEARCH_SERVER``, else the default socket if it exists."""
+	address = os.environ.get(SERVER_ENV)
+	if address:
+		return address
+	path = default_cache_dir() / "server.sock"
+	if hasattr(socket, "AF_UNIX") and path.exists():
+		return f"unix:{path}"
+	return None
+
+
+def _connect(address: str, timeout: Optional[float]) -> http.client.HTTPConnection:
+	if address.startswith("unix:"):
+		return _UnixHTTPConnection(address[len("unix:"):], timeout=timeout)
+	parts = urlsplit(address if "//" in address else f"http://{address}")
+	return http.client.HTTPConnection(parts.hostname or "127.0.0.1", parts.port or 8765, timeout=timeout)
+
+
+def _request(address: str, method: str, path: str, payload: Optional[Dict[str, object]] = None, timeout: Optional[float] = None) -> Dict[str, object]:
+	conn = _connect(address, timeout)
+	try:
+		body = json.dumps(payload).encode() if payload is not None else None
+		headers = {"Content-Type": "application/json"} if body is not None else {}
+		conn.request(method, path, body=body, headers=headers)
+		resp = conn.getresponse()
+		data = json.loads(resp.read() or b"{}")
+	except (OSError, http.client.HTTPException, ValueError) as exc:
+		raise ServerUnavailable(f"{address}: {exc}") from exc
+	finally:
+		conn.close()
+	if resp.status != 200:
+		raise ServerError(f"absearch server returned {resp.status}: {data.get('error')}", resp.status)
+	return data
+
+
+def health(address: str, timeout: float = 1.0) -> Dict[str, object]:
+	return _request(address, "GET", "/health", timeout=timeout)
+
+
+def remote_search(
+	address: str,
+	targets: List[str],
+	criteria: Criteria,
+	providers: Optional[List[str]] = None,
+	enrich: bool = True,
+	timeout: float = DEFAULT_SEARCH_TIMEOUT,
+	limit: Optional[int] = None,
+) -> Dict[str, TargetResult]:
+	"""Run a search on the server; records come back filtered and ranked.
+
+	Raises ``ServerUnavailable`` if nothing answers at ``address``, nothing
+	comes back within ``timeout`` seconds, or the server reports an error
+	(``ServerError``), so callers can fall back to searching in-process.
+	"""
+	data = _request(
+		address,
+		"POST",
+		"/search",
+		{
+			"targets": targets,
+			"criteria": criteria.model_dump(mode="json"),
+			"providers": providers,
+			"enrich": enrich,
+			"limit": limit,
+		},
+		timeout=timeout,
+	)
+	return {
+		target: TargetResult(
+			target=target,
+			records=[AntibodyRecord.model_validate(r) for r in result["records"]],
+			provider_status=result["provider_status"],
+		)
+		for target, result in data["results"].items()
+	}
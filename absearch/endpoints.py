@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# Vendors rarely move their search endpoint; re-probe weekly in case they do
+DEFAULT_ENDPOINT_TTL = 7 * 24 * 3600.0
+
+
+class EndpointMemory:
+	"""Remembers which listing URL variant works for each provider.
+
+	Providers that try several URL shapes per search record the one that
+	returned listings and go straight to it next time, probing the others only
+	when it fails. Entries expire after ``ttl`` seconds. With a ``directory``
+	they are kept in ``endpoints.json`` there and shared between runs;
+	otherwise they last as long as this object.
+	"""
+
+	def __init__(self, directory: Path | str | None = None, ttl: float = DEFAULT_ENDPOINT_TTL) -> None:
+		self.ttl = ttl
+		self._path = Path(directory) / "endpoints.json" if directory is not None else None
+		self._lock = threading.Lock()
+		self._entries: Optional[Dict[str, Dict[str, object]]] = None
+
+	def _load(self) -> Dict[str, Dict[str, object]]:
+		if self._entries is None:
+			self._entries = {}
+			if self._path is not None:
+				try:
+					self._entries = json.loads(self._path.read_text())
+				except (OSError, ValueError):
+					pass
+		return self._entries
+
+	def _save(self) -> None:
+		if self._path is None:
+			return
+		try:
+			self._path.parent.mkdir(parents=True, exist_ok=True)
+			tmp = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+			tmp.write_text(json.dumps(self._entries, indent=2, sort_keys=True))
+			os.replace(tmp, self._path)
+		except OSError:
+			# Losing what was learned only costs a re-probe
+			pass
+
+	def get(self, provider: str) -> Optional[str]:
+		with self._lock:
+			entry = self._load().get(provider)
+			if entry is None or float(entry.get("expires_at", 0)) < time.time():
+				return None
+			return str(entry["variant"])
+
+	def remember(self, provider: str, variant: str) -> None:
+		with self._lock:
+			entries = self._load()
+			entry = entries.get(provider)
+			now = time.time()
+			if entry is not None and entry.get("variant") == variant and float(entry.get("expires_at", 0)) >= now:
+				return
+			entries[provider] = {"variant": variant, "learned_at": now, "expires_at": now + self.ttl}
+			self._save()
+
+	def forget(self, provider: str) -> None:
+		with self._lock:
+			if self._load().pop(provider, None) is not None:
+				self._save()
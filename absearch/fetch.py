@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import anyio
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 6
+DEFAULT_MIN_RATE = 0.2
+DEFAULT_MAX_RATE = 20.0
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# A response this many times slower than the fastest seen counts as a slowdown
+_SLOW_FACTOR = 3.0
+_LATENCY_SMOOTHING = 0.2
+
+
+class FetchError(Exception):
+	"""A fetch that failed after retries, or was refused by an open circuit."""
+
+	def __init__(self, message: str, url: str, status_code: Optional[int] = None, retryable: bool = False) -> None:
+		super().__init__(message)
+		self.url = url
+		self.status_code = status_code
+		self.retryable = retryable
+
+
+class CircuitOpenError(FetchError):
+	pass
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+	if not value:
+		return None
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+	try:
+		return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+	except (TypeError, ValueError):
+		return None
+
+
+class TokenBucket:
+	"""Token bucket whose rate can change while it is in use.
+
+	Tracks the theoretical arrival time of the next request, so reserving a
+	token never awaits and needs no lock on a single event loop.
+	"""
+
+	def __init__(self, rate: float, burst: int) -> None:
+		self.rate = rate
+		self.burst = max(1, burst)
+		self._tat = 0.0
+
+	def _tolerance(self) -> float:
+		return (self.burst - 1) / self.rate
+
+	def reserve(self) -> float:
+		"""Take a token and return how many seconds to wait before using it."""
+		now = time.monotonic()
+		tat = max(self._tat, now)
+		start = max(now, tat - self._tolerance())
+		self._tat = tat + 1.0 / self.rate
+		return start - now
+
+	async def acquire(self) -> None:
+		delay = self.reserve()
+		if delay > 0:
+			await anyio.sleep(delay)
+
+	def pause(self, seconds: float) -> None:
+		"""Hold back every request for ``seconds``, then resume at the current rate without a burst."""
+		self._tat = max(self._tat, time.monotonic() + seconds + self._tolerance())
+
+
+class CircuitBreaker:
+	"""Stops requests to a host after consecutive failures, probing again after a cooldown."""
+
+	def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_timeout: float = DEFAULT_RESET_TIMEOUT) -> None:
+		self.failure_threshold = failure_threshold
+		self.reset_timeout = reset_timeout
+		self._failures = 0
+		self._opened_at: Optional[float] = None
+		self._probing = False
+
+	@property
+	def state(self) -> str:
+		if self._opened_at is None:
+			return "closed"
+		if self._probing or time.monotonic() - self._opened_at >= self.reset_timeout:
+			return "half-open"
+		return "open"
+
+	def allow(self) -> bool:
+		state = self.state
+		if state == "closed":
+			return True
+		if state == "half-open" and not self._probing:
+			self._probing = True
+			return True
+		return False
+
+	def record_success(self) -> None:
+		self._failures = 0
+		self._opened_at = None
+		self._probing = False
+
+	def record_failure(self) -> None:
+		self._failures += 1
+		if self._probing or self._failures >= self.failure_threshold:
+			self._opened_at = time.monotonic()
+		self._probing = False
+
+	def release_probe(self) -> None:
+		"""End a half-open probe that finished without a verdict, so the next request probes again."""
+		self._probing = False
+
+
+@dataclass
+class HostMetrics:
+	requests: int = 0
+	successes: int = 0
+	throttled: int = 0
+	server_errors: int = 0
+	transport_errors: int = 0
+	retries: int = 0
+	rejected: int = 0
+	rate: float = 0.0
+	latency_ewma: Optional[float] = None
+	latency_floor: Optional[float] = None
+	circuit: str = "closed"
+
+
+@dataclass
+class _HostState:
+	bucket: TokenBucket
+	breaker: CircuitBreaker
+	metrics: HostMetrics = field(default_factory=HostMetrics)
+
+
+class Fetcher:
+	"""Rate-limited, retrying GET shared by every fetch a provider makes.
+
+	Each host gets a token bucket that halves its rate and pauses on 429 or a
+	``Retry-After``, backs off when latency climbs well above the fastest seen,
+	and otherwise creeps up by ``increase`` requests/second per success. Failed
+	attempts are retried with jittered exponential backoff; consecutive server
+	or transport failures open the host's circuit breaker.
+	"""
+
+	def __init__(
+		self,
+		rate: float = DEFAULT_RATE,
+		burst: int = DEFAULT_BURST,
+		min_rate: float = DEFAULT_MIN_RATE,
+		max_rate: float = DEFAULT_MAX_RATE,
+		increase: float = 0.1,
+		max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+		backoff: float = 0.5,
+		max_backoff: float = 10.0,
+		failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+		reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+	) -> None:
+		self._rate = float(rate)
+		self._burst = burst
+		self._min_rate = min_rate
+		self._max_rate = max_rate
+		self._increase = increase
+		self._max_attempts = max_attempts
+		self._backoff = backoff
+		self._max_backoff = max_backoff
+		self._failure_threshold = failure_threshold
+		self._reset_timeout = reset_timeout
+		self._hosts: Dict[str, _HostState] = {}
+
+	def _host(self, url: str) -> _HostState:
+		host = urlsplit(url).netloc.lower()
+		state = self._hosts.get(host)
+		if state is None:
+			state = _HostState(
+				bucket=TokenBucket(self._rate, self._burst),
+				breaker=CircuitBreaker(self._failure_threshold, self._reset_timeout),
+			)
+			state.metrics.rate = self._rate
+			self._hosts[host] = state
+		return state
+
+	def _set_rate(self, state: _HostState, rate: float) -> None:
+		state.bucket.rate = min(self._max_rate, max(self._min_rate, rate))
+		state.metrics.rate = state.bucket.rate
+
+	def _on_throttle(self, state: _HostState, retry_after: Optional[float]) -> None:
+		state.metrics.throttled += 1
+		self._set_rate(state, state.bucket.rate / 2)
+		state.bucket.pause(retry_after if retry_after is not None else 1.0 / state.bucket.rate)
+
+	def _on_success(self, state: _HostState, latency: float) -> None:
+		metrics = state.metrics
+		metrics.successes += 1
+		if metrics.latency_ewma is None:
+			metrics.latency_ewma = latency
+		else:
+			metrics.latency_ewma += _LATENCY_SMOOTHING * (latency - metrics.latency_ewma)
+		metrics.latency_floor = min(metrics.latency_floor or latency, latency)
+		if metrics.latency_ewma > _SLOW_FACTOR * metrics.latency_floor:
+			self._set_rate(state, state.bucket.rate * 0.8)
+		else:
+			self._set_rate(state, state.bucket.rate + self._increase)
+
+	async def _attempt(self, client: httpx.AsyncClient, state: _HostState, url: str, headers: Optional[Mapping[str, str]]) -> httpx.Response:
+		# No await between the check and allow(), so this request owns the probe if it gets one
+		probe = state.breaker.state == "half-open"
+		if not state.breaker.allow():
+			state.metrics.rejected += 1
+			raise CircuitOpenError(f"circuit open for {urlsplit(url).netloc}", url)
+		try:
+			await state.bucket.acquire()
+			state.metrics.requests += 1
+			started = time.monotonic()
+			resp = await client.get(url, headers=headers)
+		except httpx.TransportError:
+			state.metrics.transport_errors += 1
+			state.breaker.record_failure()
+			raise
+		except Exception:
+			state.breaker.record_failure()
+			raise
+		except BaseException:
+			# Cancelled: says nothing about the host, but must not hold the probe forever
+			if probe:
+				state.breaker.release_probe()
+			raise
+		finally:
+			state.metrics.circuit = state.breaker.state
+
+		if resp.status_code == 429 or (resp.status_code == 503 and "retry-after" in resp.headers):
+			# A throttled host is up: throttling slows the bucket but never trips the circuit
+			state.breaker.record_success()
+			self._on_throttle(state, _retry_after_seconds(resp.headers.get("retry-after")))
+			raise FetchError(f"HTTP {resp.status_code} from {url}", url, resp.status_code, retryable=True)
+		if resp.status_code >= 500:
+			state.metrics.server_errors += 1
+			state.breaker.record_failure()
+			state.metrics.circuit = state.breaker.state
+			raise FetchError(f"HTTP {resp.status_code} from {url}", url, resp.status_code, retryable=True)
+
+		state.breaker.record_success()
+		state.metrics.circuit = state.breaker.state
+		self._on_success(state, time.monotonic() - started)
+		return resp
+
+	async def get(self, client: httpx.AsyncClient, url: str, headers: Optional[Mapping[str, str]] = None) -> httpx.Response:
+		"""GET ``url`` on ``client``, returning any response below 500 other than 429.
+
+		Raises ``FetchError`` once retries are exhausted or the circuit is open,
+		and the last ``httpx.TransportError`` if the host never answered.
+		"""
+		state = self._host(url)
+		retrying = AsyncRetrying(
+			retry=retry_if_exception(lambda exc: isinstance(exc, httpx.TransportError) or getattr(exc, "retryable", False)),
+			wait=wait_random_exponential(multiplier=self._backoff, max=self._max_backoff),
+			stop=stop_after_attempt(self._max_attempts),
+			sleep=anyio.sleep,
+			reraise=True,
+		)
+		async for attempt in retrying:
+			with attempt:
+				if attempt.retry_state.attempt_number > 1:
+					state.metrics.retries += 1
+				return await self._attempt(client, state, url, headers)
+		raise AssertionError("unreachable")
+
+	def metrics(self) -> Dict[str, Dict[str, object]]:
+		"""Snapshot of per-host counters, current rate, latency and circuit state."""
+		snapshot: Dict[str, Dict[str, object]] = {}
+		for host, state in self._hosts.items():
+			state.metrics.circuit = state.breaker.state
+			snapshot[host] = asdict(state.metrics)
+		return snapshot
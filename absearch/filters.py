@@ -1,21 +1,14 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-from .models import AntibodyRecord, Criteria
+from .models import AnyRecord, Criteria
+from .ordering import derived
+from .profiling import count, span
 
 
-def _computed_amount_ug(record: AntibodyRecord) -> float | None:
-	if record.amount_ug is not None:
-		return record.amount_ug
-	if record.concentration_mg_per_ml is not None and record.volume_ul is not None:
-		# mg/mL * uL = (mg/mL) * (uL) = mg * (uL/mL)
-		# 1 mL = 1000 uL, so multiply by (uL / 1000) to get mg, then *1000 to ug → net: mg/mL * uL = ug
-		return record.concentration_mg_per_ml * record.volume_ul
-	return None
-
-
-def record_matches_criteria(record: AntibodyRecord, criteria: Criteria) -> bool:
+def record_matches_criteria(record: AnyRecord, criteria: Criteria) -> bool:
 	if criteria.species_reactivity:
 		if not set(x.lower() for x in (record.validated_reactivity or [])).intersection(
 			set(x.lower() for x in criteria.species_reactivity)
@@ -55,12 +48,170 @@ def record_matches_criteria(record: AntibodyRecord, criteria: Criteria) -> bool:
 			return False
 
 	if criteria.min_amount_ug is not None:
-		amt = _computed_amount_ug(record)
+		amt = derived(record).amount_ug
 		if amt is None or amt < criteria.min_amount_ug:
 			return False
 
 	return True
 
 
-def filter_records(records: Iterable[AntibodyRecord], criteria: Criteria) -> List[AntibodyRecord]:
-	return [r for r in records if record_matches_criteria(r, criteria)]
+# Record fields each criterion reads
+_CRITERIA_FIELDS: Dict[str, Tuple[str, ...]] = {
+	"species_reactivity": ("validated_reactivity",),
+	"host_species": ("host_species",),
+	"clonality": ("clonality",),
+	"applications": ("applications",),
+	"conjugation": ("conjugation",),
+	"min_citations": ("citations_count",),
+	"max_price": ("price",),
+	"min_amount_ug": ("amount_ug", "concentration_mg_per_ml", "volume_ul"),
+}
+
+
+def restrict_criteria(criteria: Criteria, fields: Iterable[str]) -> Criteria:
+	"""Keep only the criteria that can be decided from ``fields`` alone.
+
+	Used to prefilter listing records before enrichment: a record failing the
+	restricted criteria fails the full criteria whatever enrichment adds.
+	"""
+	known = set(fields)
+	return Criteria(**{
+		name: getattr(criteria, name)
+		for name, needs in _CRITERIA_FIELDS.items()
+		if known.issuperset(needs)
+	})
+
+
+def filter_records(records: Iterable[AnyRecord], criteria: Criteria) -> List[AnyRecord]:
+	records = records if isinstance(records, list) else list(records)
+	with span("filter", records=len(records)) as sp:
+		kept = [r for r in records if record_matches_criteria(r, criteria)]
+		sp.set(kept=len(kept))
+	count("records.filtered_out", len(records) - len(kept))
+	return kept
+
+
+# Positions of the set bits in every byte value, for decoding bitsets quickly
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def _bitset(indices: Iterable[int], size: int) -> int:
+	buf = bytearray((size + 7) // 8)
+	for i in indices:
+		buf[i >> 3] |= 1 << (i & 7)
+	return int.from_bytes(buf, "little")
+
+
+class _NumericColumn:
+	"""Sorted numeric column answering threshold queries as bitsets."""
+
+	def __init__(self, values: Sequence[Optional[float]]) -> None:
+		self._size = len(values)
+		present = sorted((v, i) for i, v in enumerate(values) if v is not None)
+		self._values = [v for v, _ in present]
+		self._rows = [i for _, i in present]
+		self.missing = _bitset((i for i, v in enumerate(values) if v is None), self._size)
+		self._cache: Dict[Tuple[str, float], int] = {}
+
+	def at_least(self, threshold: float) -> int:
+		key = ("ge", threshold)
+		if key not in self._cache:
+			start = bisect_left(self._values, threshold)
+			self._cache[key] = _bitset(self._rows[start:], self._size)
+		return self._cache[key]
+
+	def at_most(self, threshold: float) -> int:
+		key = ("le", threshold)
+		if key not in self._cache:
+			end = bisect_right(self._values, threshold)
+			self._cache[key] = _bitset(self._rows[:end], self._size)
+		return self._cache[key]
+
+
+class FilterIndex:
+	"""Bitset index over one result set for evaluating many Criteria against it.
+
+	Building the index scans the records once; every categorical field gets a
+	bitset per lowercased value and the numeric fields become sorted columns.
+	Each ``filter`` call is then a handful of integer AND/OR operations and
+	returns the same records, in the same order, as ``filter_records``.
+	"""
+
+	def __init__(self, records: Iterable[AnyRecord]) -> None:
+		self.records: List[AnyRecord] = list(records)
+		size = len(self.records)
+		self._size = size
+		self._all = (1 << size) - 1
+
+		reactivity: Dict[str, List[int]] = {}
+		applications: Dict[str, List[int]] = {}
+		host: Dict[str, List[int]] = {}
+		clonality: Dict[str, List[int]] = {}
+		conjugation: Dict[str, List[int]] = {}
+		for i, r in enumerate(self.records):
+			for value in set(x.lower() for x in (r.validated_reactivity or [])):
+				reactivity.setdefault(value, []).append(i)
+			for value in set(x.lower() for x in (r.applications or [])):
+				applications.setdefault(value, []).append(i)
+			if r.host_species is not None:
+				host.setdefault(r.host_species.lower(), []).append(i)
+			if r.clonality is not None:
+				clonality.setdefault(r.clonality.lower(), []).append(i)
+			if r.conjugation is not None:
+				conjugation.setdefault(r.conjugation.lower(), []).append(i)
+
+		def _bitsets(groups: Dict[str, List[int]]) -> Dict[str, int]:
+			return {value: _bitset(rows, size) for value, rows in groups.items()}
+
+		self._reactivity = _bitsets(reactivity)
+		self._applications = _bitsets(applications)
+		self._host = _bitsets(host)
+		self._clonality = _bitsets(clonality)
+		self._conjugation = _bitsets(conjugation)
+
+		self._citations = _NumericColumn([r.citations_count for r in self.records])
+		self._price = _NumericColumn([r.price for r in self.records])
+		self._amount = _NumericColumn([derived(r).amount_ug for r in self.records])
+
+	def __len__(self) -> int:
+		return self._size
+
+	@staticmethod
+	def _any_of(bitsets: Dict[str, int], wanted: Iterable[str]) -> int:
+		mask = 0
+		for value in set(x.lower() for x in wanted):
+			mask |= bitsets.get(value, 0)
+		return mask
+
+	def mask(self, criteria: Criteria) -> int:
+		"""Bitset of the records matching ``criteria``; bit ``i`` is ``records[i]``."""
+		mask = self._all
+		if criteria.species_reactivity:
+			mask &= self._any_of(self._reactivity, criteria.species_reactivity)
+		if criteria.host_species:
+			mask &= self._any_of(self._host, criteria.host_species)
+		if criteria.clonality:
+			mask &= self._any_of(self._clonality, criteria.clonality)
+		if criteria.applications:
+			for value in set(x.lower() for x in criteria.applications):
+				mask &= self._applications.get(value, 0)
+		if criteria.conjugation:
+			mask &= self._any_of(self._conjugation, criteria.conjugation)
+		if criteria.min_citations is not None:
+			mask &= self._citations.at_least(criteria.min_citations)
+		if criteria.max_price is not None:
+			mask &= self._price.at_most(criteria.max_price) | self._price.missing
+		if criteria.min_amount_ug is not None:
+			mask &= self._amount.at_least(criteria.min_amount_ug)
+		return mask
+
+	def indices(self, mask: int) -> List[int]:
+		rows: List[int] = []
+		for byte_index, byte in enumerate(mask.to_bytes((self._size + 7) // 8, "little")):
+			if byte:
+				base = byte_index << 3
+				rows.extend(base + bit for bit in _BYTE_BITS[byte])
+		return rows
+
+	def filter(self, criteria: Criteria) -> List[AnyRecord]:
+		return [self.records[i] for i in self.indices(self.mask(criteria))]
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import List, Optional
 
-from playwright.sync_api import sync_playwright
+import anyio
+
+from .profiling import span
 
 
 def fetch_html(url: str, wait_selector: Optional[str] = None, timeout_ms: int = 20000) -> str:
-	with sync_playwright() as p:
+	# Playwright is imported on first render; it is a large share of CLI startup
+	from playwright.sync_api import sync_playwright
+
+	with span("headless.render", url=url, pooled=False), sync_playwright() as p:
 		browser = p.chromium.launch(headless=True)
 		try:
 			context = browser.new_context()
@@ -22,3 +27,112 @@ def fetch_html(url: str, wait_selector: Optional[str] = None, timeout_ms: int =
 			return page.content()
 		finally:
 			browser.close()
+
+
+class _PageSlot:
+	__slots__ = ("context", "page", "uses")
+
+	def __init__(self, context, page) -> None:
+		self.context = context
+		self.page = page
+		self.uses = 0
+
+
+class BrowserPool:
+	"""Long-lived headless Chromium serving fetches from a pool of reusable pages.
+
+	The browser is launched on first use. At most ``size`` pages render at once;
+	a page (and its context) is recycled after ``max_uses_per_page`` fetches or
+	as soon as a fetch fails, and the browser is relaunched if it disconnects.
+	"""
+
+	def __init__(self, size: int = 4, max_uses_per_page: int = 50, timeout_ms: int = 20000) -> None:
+		self._size = max(1, size)
+		self._max_uses = max(1, max_uses_per_page)
+		self._timeout_ms = timeout_ms
+		self._semaphore = anyio.Semaphore(self._size)
+		self._start_lock = anyio.Lock()
+		self._playwright = None
+		self._browser = None
+		self._idle: List[_PageSlot] = []
+
+	async def __aenter__(self) -> "BrowserPool":
+		await self.start()
+		return self
+
+	async def __aexit__(self, *exc_info) -> None:
+		await self.close()
+
+	async def start(self) -> None:
+		async with self._start_lock:
+			if self._browser is not None and self._browser.is_connected():
+				return
+			self._idle.clear()
+			if self._playwright is None:
+				from playwright.async_api import async_playwright
+
+				self._playwright = await async_playwright().start()
+			self._browser = await self._playwright.chromium.launch(headless=True)
+
+	async def close(self) -> None:
+		async with self._start_lock:
+			self._idle.clear()
+			if self._browser is not None:
+				try:
+					await self._browser.close()
+				except Exception:
+					pass
+				self._browser = None
+			if self._playwright is not None:
+				await self._playwright.stop()
+				self._playwright = None
+
+	async def _acquire(self) -> _PageSlot:
+		if self._browser is None or not self._browser.is_connected():
+			await self.start()
+		while self._idle:
+			slot = self._idle.pop()
+			if not slot.page.is_closed():
+				return slot
+			await self._discard(slot)
+		context = await self._browser.new_context()
+		page = await context.new_page()
+		return _PageSlot(context, page)
+
+	async def _discard(self, slot: _PageSlot) -> None:
+		try:
+			await slot.context.close()
+		except Exception:
+			pass
+
+	async def _release(self, slot: _PageSlot, healthy: bool) -> None:
+		slot.uses += 1
+		if healthy and slot.uses < self._max_uses and not slot.page.is_closed():
+			self._idle.append(slot)
+		else:
+			await self._discard(slot)
+
+	@asynccontextmanager
+	async def page(self):
+		"""Borrow a pooled page; it is recycled if the block raises."""
+		async with self._semaphore:
+			slot = await self._acquire()
+			healthy = False
+			try:
+				yield slot.page
+				healthy = True
+			finally:
+				await self._release(slot, healthy)
+
+	async def fetch_html(self, url: str, wait_selector: Optional[str] = None, timeout_ms: Optional[int] = None) -> str:
+		timeout = timeout_ms or self._timeout_ms
+		async with self.page() as page:
+			with span("headless.render", url=url, pooled=True):
+				page.set_default_timeout(timeout)
+				await page.goto(url)
+				if wait_selector:
+					try:
+						await page.wait_for_selector(wait_selector, state="visible", timeout=timeout)
+					except Exception:
+						pass
+				return await page.content()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, PrivateAttr
 
 
 class PackageOption(BaseModel):
@@ -14,6 +15,19 @@ class PackageOption(BaseModel):
 	volume_ul: Optional[float] = None
 
 
+class Derived(NamedTuple):
+	"""Values computed from a record's fields, cached on the record by ``ordering.derived``."""
+
+	application_codes: Tuple[str, ...]
+	application_score: int
+	# Formulation flags that are True (BSA, gelatin, ascites free)
+	formulation_bonus: int
+	# amount_ug, else concentration x volume
+	amount_ug: Optional[float]
+	# (amount_ug, price, currency, label) from pick_best_package at its default minimum
+	best_package: Optional[Tuple[float, float, Optional[str], Optional[str]]]
+
+
 class AntibodyRecord(BaseModel):
 	vendor: str
 	catalog_number: str = Field(description="Vendor catalog or SKU identifier")
@@ -56,6 +70,8 @@ class AntibodyRecord(BaseModel):
 	notes: Optional[str] = None
 	meta: Dict[str, str] = Field(default_factory=dict)
 
+	_derived: Optional[Derived] = PrivateAttr(default=None)
+
 
 class Criteria(BaseModel):
 	species_reactivity: Optional[List[str]] = None
@@ -67,3 +83,101 @@ class Criteria(BaseModel):
 	min_citations: Optional[int] = None
 	max_price: Optional[float] = None
 	min_amount_ug: Optional[float] = None
+
+
+def _slotted(cls: type) -> type:
+	"""Rebuild dataclass ``cls`` with ``__slots__`` for its fields, as ``dataclass(slots=True)`` does on Python 3.10+.
+
+	Defaults stop being class attributes, so every field must be set by ``__init__``.
+	"""
+	names = tuple(f.name for f in fields(cls))
+	unset = [f.name for f in fields(cls) if not f.init]
+	if unset:
+		raise TypeError(f"{cls.__name__}: init=False fields would be left unset: {', '.join(unset)}")
+	namespace = {key: value for key, value in cls.__dict__.items() if key not in names and key not in ("__dict__", "__weakref__")}
+	namespace["__slots__"] = names
+	return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
+@dataclass
+class RecordDraft:
+	"""Unvalidated, slotted stand-in for ``AntibodyRecord`` used inside the pipeline.
+
+	Providers build drafts for every parsed candidate; filtering, sorting and
+	rendering read the same attribute names, and only records that reach an
+	output are validated with ``promote``.
+	"""
+
+	vendor: str
+	catalog_number: str
+	name: str
+	target: str
+
+	url: Optional[str] = None
+	datasheet_url: Optional[str] = None
+
+	host_species: Optional[str] = None
+	clonality: Optional[str] = None
+	clone: Optional[str] = None
+	isotype: Optional[str] = None
+
+	applications: List[str] = field(default_factory=list)
+	validated_reactivity: List[str] = field(default_factory=list)
+
+	conjugation: Optional[str] = None
+	size: Optional[str] = None
+	price: Optional[float] = None
+	currency: Optional[str] = None
+
+	formulation: Optional[str] = None
+	is_bsa_free: Optional[bool] = None
+	is_gelatin_free: Optional[bool] = None
+	is_ascites_free: Optional[bool] = None
+
+	amount_ug: Optional[float] = None
+	concentration_mg_per_ml: Optional[float] = None
+	volume_ul: Optional[float] = None
+
+	package_options: List[PackageOption] = field(default_factory=list)
+
+	citations_count: Optional[int] = None
+	validation_images: Optional[int] = None
+
+	notes: Optional[str] = None
+	meta: Dict[str, str] = field(default_factory=dict)
+
+	# Set by ordering.derived; an init argument only so the slotted __init__ assigns it
+	_derived: Optional[Derived] = field(default=None, repr=False, compare=False)
+
+	def to_record(self) -> AntibodyRecord:
+		record = AntibodyRecord.model_validate(self, from_attributes=True)
+		record._derived = self._derived
+		return record
+
+
+AnyRecord = Union[AntibodyRecord, RecordDraft]
+
+
+def promote(record: AnyRecord) -> AntibodyRecord:
+	"""Validate a pipeline record into an ``AntibodyRecord`` (no-op if it already is one)."""
+	if isinstance(record, AntibodyRecord):
+		return record
+	return record.to_record()
+
+
+@dataclass
+class TargetResult:
+	target: str
+	records: List[AnyRecord] = field(default_factory=list)
+	# Per provider: ok, timeout or error: <reason>
+	provider_status: Dict[str, str] = field(default_factory=dict)
+
+	@property
+	def status(self) -> str:
+		statuses = list(self.provider_status.values())
+		if statuses and all(s == "ok" for s in statuses):
+			return "ok"
+		if any(s == "ok" for s in statuses):
+			return "partial"
+		return "failed"
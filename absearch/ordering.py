@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import heapq
+from functools import lru_cache
+from typing import Iterable, List, Tuple
 import re
 
-from .models import AntibodyRecord
+from .models import AnyRecord, Derived, RecordDraft
+from .selection import _amount_ug_from, pick_best_package
 
 
 # Phrase-level synonyms searched across the full string (case-insensitive)
@@ -50,35 +53,53 @@ _PHRASE_SYNONYMS: list[tuple[re.Pattern, str]] = [
 _PRIORITY = ["ICFC", "ICC", "IHC"]
 
 
+def _compile_matcher() -> Tuple[re.Pattern, List[str]]:
+	"""Fold the synonym table into one regex with a named group per code.
+
+	Each code gets an optional lookahead that scans the whole string for any of
+	its phrases, so a single ``match`` at position 0 reports every code present,
+	including codes whose phrases overlap (e.g. ICFC and FC on "flow cytometry,
+	intracellular").
+	"""
+	phrases: dict[str, list[str]] = {}
+	for pat, code in _PHRASE_SYNONYMS:
+		phrases.setdefault(code, []).append(f"(?:{pat.pattern})")
+	order = list(phrases)
+	pattern = "".join(
+		f"(?=[\\s\\S]*?(?P<{code}>{'|'.join(alts)}))?" for code, alts in phrases.items()
+	)
+	return re.compile(pattern, re.I), order
+
+
+_MATCHER, _CODE_ORDER = _compile_matcher()
+
+
+@lru_cache(maxsize=4096)
+def _codes_for_text(text: str) -> Tuple[str, ...]:
+	# Tokens split on whitespace, commas and slashes are bounded by non-word
+	# characters, so any token-level full match is also found by the whole-string
+	# scan and a separate per-token pass cannot add codes.
+	match = _MATCHER.match(text)
+	return tuple(code for code in _CODE_ORDER if match.group(code) is not None)
+
+
 def normalize_applications(apps: Iterable[str]) -> List[str]:
 	codes: list[str] = []
 	for app in apps or []:
 		text = (app or "").strip()
 		if not text:
 			continue
-		for pat, code in _PHRASE_SYNONYMS:
-			if pat.search(text):
-				codes.append(code)
-		# Also split on common delimiters and re-check small tokens
-		for token in re.split(r"[\s,\/]+", text):
-			token = token.strip()
-			if not token:
-				continue
-			for pat, code in _PHRASE_SYNONYMS:
-				if pat.fullmatch(token):
-					codes.append(code)
+		codes.extend(_codes_for_text(text))
 	# Deduplicate while preserving order
-	seen = set()
-	ordered: list[str] = []
-	for c in codes:
-		if c not in seen:
-			seen.add(c)
-			ordered.append(c)
-	return ordered
+	return list(dict.fromkeys(codes))
 
 
 def compute_application_score(apps: Iterable[str]) -> int:
-	norm = set(normalize_applications(apps))
+	return _score_codes(normalize_applications(apps))
+
+
+def _score_codes(codes: Iterable[str]) -> int:
+	norm = set(codes)
 	score = 0
 	if "ICFC" in norm:
 		score = max(score, 3)
@@ -89,15 +110,129 @@ def compute_application_score(apps: Iterable[str]) -> int:
 	return score
 
 
-def sort_records_by_priority(records: List[AntibodyRecord]) -> List[AntibodyRecord]:
-	def sort_key(r: AntibodyRecord):
-		bsa_bonus = 1 if r.is_bsa_free else 0 if r.is_bsa_free is not None else 0
-		gel_bonus = 1 if r.is_gelatin_free else 0 if r.is_gelatin_free is not None else 0
-		ascites_bonus = 1 if r.is_ascites_free else 0 if r.is_ascites_free is not None else 0
-		app_score = compute_application_score(r.applications)
-		cit = r.citations_count or 0
-		price = r.price if r.price is not None else float("inf")
-		# Sort: add formulation bonuses (higher is better), then app_score desc, citations desc, price asc
-		return (-(bsa_bonus + gel_bonus + ascites_bonus), -app_score, -cit, price, r.vendor, r.catalog_number)
+def derived(r: AnyRecord) -> Derived:
+	"""The record's derived fields, computed on first use and cached on the record.
+
+	Filtering, sorting, rendering and the catalog all read these, so the
+	application regexes and package scan run once per record. Call
+	``invalidate`` after changing the fields they depend on.
+	"""
+	draft = type(r) is RecordDraft
+	# Pydantic serves private attributes through __getattr__, far too slow for a per-record hot path
+	d = r._derived if draft else r.__pydantic_private__["_derived"]
+	if d is None:
+		codes = tuple(normalize_applications(r.applications))
+		d = Derived(
+			application_codes=codes,
+			application_score=_score_codes(codes),
+			formulation_bonus=(1 if r.is_bsa_free else 0) + (1 if r.is_gelatin_free else 0) + (1 if r.is_ascites_free else 0),
+			amount_ug=_amount_ug_from(r.concentration_mg_per_ml, r.volume_ul, r.amount_ug),
+			best_package=pick_best_package(r),
+		)
+		if draft:
+			r._derived = d
+		else:
+			r.__pydantic_private__["_derived"] = d
+	return d
+
+
+def invalidate(r: AnyRecord) -> None:
+	r._derived = None
+
+
+PriorityKey = Tuple[int, int, int, float, str, str]
+
+
+def priority_key(r: AnyRecord) -> PriorityKey:
+	"""Sort key ranking records best first: formulation bonuses, application score, citations desc, price asc."""
+	d = derived(r)
+	cit = r.citations_count or 0
+	price = r.price if r.price is not None else float("inf")
+	return (-d.formulation_bonus, -d.application_score, -cit, price, r.vendor, r.catalog_number)
+
+
+def best_possible_key(r: AnyRecord, final_fields: Iterable[str] = ()) -> PriorityKey:
+	"""The best ``priority_key`` the record could reach once enrichment fills its missing fields.
+
+	Missing fields are assumed to come back with their best value unless named
+	in ``final_fields`` (a provider's ``listing_fields``), which enrichment never changes.
+	"""
+	final = set(final_fields)
+
+	def _open(field: str) -> bool:
+		return field not in final and getattr(r, field) in (None, [])
+
+	bonus = sum(
+		1 if _open(field) else int(bool(getattr(r, field)))
+		for field in ("is_bsa_free", "is_gelatin_free", "is_ascites_free")
+	)
+	app_score = 3 if _open("applications") else derived(r).application_score
+	cit = float("inf") if _open("citations_count") else (r.citations_count or 0)
+	price = 0.0 if _open("price") else (r.price if r.price is not None else float("inf"))
+	return (-bonus, -app_score, -cit, price, r.vendor, r.catalog_number)
+
+
+def sort_records_by_priority(records: List[AnyRecord]) -> List[AnyRecord]:
+	return sorted(records, key=priority_key)
+
+
+class _Worst:
+	"""Heap entry ordering larger keys first, so ``heap[0]`` is the worst record kept."""
+
+	__slots__ = ("key", "seq", "record")
+
+	def __init__(self, key: PriorityKey, seq: int, record: AnyRecord) -> None:
+		self.key = key
+		self.seq = seq
+		self.record = record
+
+	def __lt__(self, other: "_Worst") -> bool:
+		return (self.key, self.seq) > (other.key, other.seq)
+
+
+class TopK:
+	"""Keeps the ``k`` best records by ``priority_key`` as they arrive.
+
+	A bounded heap with the worst kept record on top: once full, a record is
+	admitted only if it beats that one. ``can_enter`` answers the same question
+	for a key without a record, so callers can skip work (enrichment, formatting)
+	for records that can no longer make the cut.
+	"""
+
+	def __init__(self, k: int) -> None:
+		self.k = max(0, k)
+		self._heap: List[_Worst] = []
+		self._seq = 0
+
+	def __len__(self) -> int:
+		return len(self._heap)
+
+	def can_enter(self, key: PriorityKey) -> bool:
+		if len(self._heap) < self.k:
+			return True
+		return self.k > 0 and key < self._heap[0].key
+
+	def push(self, record: AnyRecord) -> bool:
+		"""Offer a record; returns whether it is (for now) among the best ``k``."""
+		key = priority_key(record)
+		if not self.can_enter(key):
+			return False
+		self._seq += 1
+		entry = _Worst(key, self._seq, record)
+		if len(self._heap) < self.k:
+			heapq.heappush(self._heap, entry)
+		else:
+			heapq.heapreplace(self._heap, entry)
+		return True
+
+	def records(self) -> List[AnyRecord]:
+		"""The kept records, best first."""
+		return [e.record for e in sorted(self._heap, key=lambda e: (e.key, e.seq))]
+
 
-	return sorted(records, key=sort_key)
+def top_k_by_priority(records: Iterable[AnyRecord], k: int) -> List[AnyRecord]:
+	"""The ``k`` best records in ``sort_records_by_priority`` order, without sorting them all."""
+	top = TopK(k)
+	for r in records:
+		top.push(r)
+	return top.records()
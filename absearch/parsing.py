@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import AbstractSet, Callable, FrozenSet, List, Optional, Tuple, TypeVar
+
+import anyio
+
+from .profiling import span
+
+
+T = TypeVar("T")
+
+DEFAULT_PARSE_CACHE_SIZE = 256
+
+# Below this size pickling the page and the records costs more than parsing in-process saves
+MIN_PROCESS_BYTES = 32 * 1024
+
+
+def default_parse_workers() -> int:
+	return os.cpu_count() or 1
+
+
+def body_hash(body: str) -> str:
+	return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+	"""LRU of parsed listing records keyed by page body hash and target.
+
+	Lives as long as the provider holding it, so a target searched again in
+	the same session (or by a long-running server) skips parsing pages whose
+	bodies have not changed. Records are copied on the way in and out because
+	enrichment fills fields on the records it is handed.
+
+	A parse that skipped already-known catalog numbers is cached with the ones
+	it ``omitted``, and only serves lookups whose ``known`` set covers them.
+	"""
+
+	def __init__(self, maxsize: int = DEFAULT_PARSE_CACHE_SIZE) -> None:
+		self.maxsize = maxsize
+		self._entries: "OrderedDict[Tuple[str, str], Tuple[FrozenSet[str], List[object]]]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, digest: str, target: str, known: AbstractSet[str] = frozenset()) -> Optional[List[object]]:
+		with self._lock:
+			entry = self._entries.get((digest, target))
+			if entry is None or not entry[0] <= known:
+				return None
+			self._entries.move_to_end((digest, target))
+		return [copy.copy(r) for r in entry[1]]
+
+	def put(self, digest: str, target: str, records: List[object], omitted: AbstractSet[str] = frozenset()) -> None:
+		if self.maxsize <= 0:
+			return
+		with self._lock:
+			self._entries[(digest, target)] = (frozenset(omitted), [copy.copy(r) for r in records])
+			self._entries.move_to_end((digest, target))
+			while len(self._entries) > self.maxsize:
+				self._entries.popitem(last=False)
+
+
+class ParseExecutor:
+	"""Runs CPU-bound page parsing off the event loop.
+
+	With ``workers`` > 0, pages of at least ``min_process_bytes`` are parsed in
+	anyio's worker process pool, at most ``workers`` at a time, so pages fetched
+	concurrently are parsed on several cores while the loop keeps fetching. The
+	function must be module-level, and its arguments and result picklable. With
+	0 workers, or for small pages, it runs on a worker thread instead.
+	"""
+
+	def __init__(self, workers: int = 0, min_process_bytes: int = MIN_PROCESS_BYTES) -> None:
+		self.workers = max(0, workers)
+		self.min_process_bytes = min_process_bytes
+		self._limiter: Optional[anyio.CapacityLimiter] = None
+
+	def _get_limiter(self) -> anyio.CapacityLimiter:
+		# Created on first use: a limiter needs a running event loop
+		if self._limiter is None:
+			self._limiter = anyio.CapacityLimiter(self.workers)
+		return self._limiter
+
+	async def run(self, func: Callable[..., T], *args, size: int = 0) -> T:
+		if self.workers and size >= self.min_process_bytes:
+			# Imported here so runs that never use the pool skip loading it
+			from anyio import to_process
+
+			with span("parse.process", func=func.__name__, bytes=size):
+				return await to_process.run_sync(func, *args, limiter=self._get_limiter())
+		return await anyio.to_thread.run_sync(func, *args)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import sniffio
+
+
+class _NullSpan:
+	"""Shared stand-in returned by ``span`` while profiling is off."""
+
+	__slots__ = ()
+
+	def __enter__(self) -> "_NullSpan":
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		return None
+
+	def set(self, **attrs) -> None:
+		return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+	__slots__ = ("_profiler", "name", "attrs", "track", "start_ns")
+
+	def __init__(self, profiler: "Profiler", name: str, attrs: Dict[str, object]) -> None:
+		self._profiler = profiler
+		self.name = name
+		self.attrs = attrs
+		self.track = ""
+		self.start_ns = 0
+
+	def __enter__(self) -> "Span":
+		self.track = _current_track()
+		self.start_ns = time.perf_counter_ns()
+		return self
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		end_ns = time.perf_counter_ns()
+		if exc_type is not None:
+			self.attrs["error"] = exc_type.__name__
+		self._profiler._finish(self, end_ns)
+
+	def set(self, **attrs) -> None:
+		self.attrs.update(attrs)
+
+
+def _current_track() -> str:
+	"""Name the task or thread a span runs on, so concurrent spans land on separate trace rows."""
+	try:
+		sniffio.current_async_library()
+	except sniffio.AsyncLibraryNotFoundError:
+		return f"thread-{threading.get_ident()}"
+	# Only reached inside a running event loop, where anyio is already imported
+	import anyio
+
+	return f"task-{anyio.get_current_task().id}"
+
+
+class Profiler:
+	"""Collects spans and counters for one run and writes them as JSON or a Chrome trace."""
+
+	def __init__(self) -> None:
+		self._origin_ns = time.perf_counter_ns()
+		self._lock = threading.Lock()
+		self._spans: List[Tuple[str, str, int, int, Dict[str, object]]] = []
+		self._counters: Dict[str, float] = {}
+		self._info: Dict[str, object] = {}
+
+	def span(self, name: str, attrs: Dict[str, object]) -> Span:
+		return Span(self, name, attrs)
+
+	def _finish(self, span: Span, end_ns: int) -> None:
+		with self._lock:
+			self._spans.append((span.name, span.track, span.start_ns - self._origin_ns, end_ns - span.start_ns, span.attrs))
+
+	def count(self, name: str, value: float = 1) -> None:
+		with self._lock:
+			self._counters[name] = self._counters.get(name, 0) + value
+
+	def annotate(self, key: str, value: object) -> None:
+		self._info[key] = value
+
+	def summary(self) -> Dict[str, Dict[str, float]]:
+		stages: Dict[str, Dict[str, float]] = {}
+		for name, _, _, dur, _ in self._spans:
+			stage = stages.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+			stage["count"] += 1
+			stage["total_ms"] += dur / 1e6
+			stage["max_ms"] = max(stage["max_ms"], dur / 1e6)
+		return stages
+
+	def to_json(self) -> Dict[str, object]:
+		return {
+			"summary": self.summary(),
+			"counters": dict(self._counters),
+			"info": self._info,
+			"spans": [
+				{"name": name, "track": track, "start_ms": start / 1e6, "duration_ms": dur / 1e6, "attrs": attrs}
+				for name, track, start, dur, attrs in self._spans
+			],
+		}
+
+	def to_chrome_trace(self) -> Dict[str, object]:
+		"""Trace Event Format, loadable in chrome://tracing or Perfetto."""
+		pid = os.getpid()
+		tids: Dict[str, int] = {}
+		events: List[Dict[str, object]] = []
+		for name, track, start, dur, attrs in self._spans:
+			tid = tids.setdefault(track, len(tids) + 1)
+			events.append({
+				"name": name,
+				"cat": name.split(".")[0],
+				"ph": "X",
+				"ts": start / 1e3,
+				"dur": dur / 1e3,
+				"pid": pid,
+				"tid": tid,
+				"args": {k: v if isinstance(v, (int, float, bool, str)) or v is None else str(v) for k, v in attrs.items()},
+			})
+		for track, tid in tids.items():
+			events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": track}})
+		end = (time.perf_counter_ns() - self._origin_ns) / 1e3
+		for name, value in self._counters.items():
+			events.append({"name": name, "ph": "C", "ts": end, "pid": pid, "args": {"value": value}})
+		return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"info": self._info}}
+
+	def write(self, path: str, fmt: str = "json") -> None:
+		data = self.to_chrome_trace() if fmt == "chrome" else self.to_json()
+		with open(path, "w") as fh:
+			json.dump(data, fh, indent=None if fmt == "chrome" else 2, default=str)
+
+
+# The active profiler; None keeps every hook down to a global lookup and a call
+_active: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+	global _active
+	_active = Profiler()
+	return _active
+
+
+def disable() -> Optional[Profiler]:
+	global _active
+	profiler, _active = _active, None
+	return profiler
+
+
+def active() -> Optional[Profiler]:
+	return _active
+
+
+def span(name: str, **attrs):
+	"""Time a block as ``name``; call ``.set(...)`` on the result to attach attributes found inside it."""
+	if _active is None:
+		return _NULL_SPAN
+	return _active.span(name, attrs)
+
+
+def count(name: str, value: float = 1) -> None:
+	if _active is not None:
+		_active.count(name, value)
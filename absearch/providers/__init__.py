@@ -1,9 +1,68 @@
-from .base import AntibodyProvider
-from .mock import MockProvider
-from .abcam import AbcamProvider
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Dict, List
+
+from .base import AntibodyProvider, FetchedPage, PagedProvider
+
+# Third-party packages register providers under this entry point group, e.g.
+#   [project.entry-points."absearch.providers"]
+#   myvendor = "myvendor_absearch:MyVendorProvider"
+ENTRY_POINT_GROUP = "absearch.providers"
+
+# Built-in providers by name; each module is imported only when its provider is selected
+_BUILTIN: Dict[str, str] = {
+	"abcam": "absearch.providers.abcam:AbcamProvider",
+	"mock": "absearch.providers.mock:MockProvider",
+}
+
+_CLASS_MODULES = {target.rpartition(":")[2]: target for target in _BUILTIN.values()}
+
+
+def _import_target(target: str) -> type:
+	module_name, _, attr = target.partition(":")
+	return getattr(import_module(module_name), attr)
+
+
+def _entry_points() -> Dict[str, object]:
+	from importlib.metadata import entry_points
+
+	return {ep.name.lower(): ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def available_providers() -> List[str]:
+	return sorted(set(_BUILTIN) | set(_entry_points()))
+
+
+def load_provider(name: str) -> type:
+	"""Resolve a provider class by name, importing its module on first use.
+
+	Built-in names win; anything else is looked up in the ``absearch.providers``
+	entry point group. Raises ``KeyError`` for unknown names.
+	"""
+	key = name.lower()
+	if key in _BUILTIN:
+		return _import_target(_BUILTIN[key])
+	entry_point = _entry_points().get(key)
+	if entry_point is None:
+		raise KeyError(f"unknown provider {name!r}; available: {', '.join(available_providers())}")
+	return entry_point.load()
+
+
+def __getattr__(name: str) -> type:
+	# Keep ``from absearch.providers import AbcamProvider`` working without eager imports
+	if name in _CLASS_MODULES:
+		return _import_target(_CLASS_MODULES[name])
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
 	"AntibodyProvider",
+	"FetchedPage",
+	"PagedProvider",
 	"MockProvider",
 	"AbcamProvider",
+	"ENTRY_POINT_GROUP",
+	"available_providers",
+	"load_provider",
 ]
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+import importlib.util
 import re
-from typing import Iterable, List, Optional
+from functools import lru_cache
+from html import unescape
+from typing import AbstractSet, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin
 
+import anyio
+import anyio.abc
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
-from ..models import AntibodyRecord
-from ..headless import fetch_html
+from ..cache import CachedResponse, ResponseCache
+from ..endpoints import EndpointMemory
+from ..fetch import FetchError, Fetcher
+from ..models import PackageOption, RecordDraft
+from ..headless import BrowserPool, fetch_html
+from ..parsing import ParseCache, ParseExecutor, body_hash
+from ..profiling import count, span
+from .base import DEFAULT_MAX_PAGES, FetchedPage
 
 
 _ABCAM_PRIMARY_URLS = [
@@ -15,6 +27,24 @@ _ABCAM_PRIMARY_URLS = [
 	"https://www.abcam.com/products/primary-antibodies",
 ]
 
+_DEFAULT_HEADERS = {
+	"User-Agent": "AbSearch/0.1 (+https://github.com/johnblair7/AbSearch)",
+	"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+# lxml builds the same tree much faster than the stdlib parser when it is installed
+_PARSER_BACKEND = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+# Marks an element that contains links to more than one product
+_MIXED = object()
+
+# ``<a rel="next" href=...>``, ``<link rel="next" ...>`` or a link labelled "Next page"
+_NEXT_LINK = re.compile(r"<(?:a|link)\b[^>]*?(?:\brel=[\"']?next\b|\baria-label=[\"']next\b)[^>]*>", re.IGNORECASE)
+_HREF = re.compile(r"\bhref=[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 _APP_PATTERNS = [
 	("ICFC", [r"intracellular flow", r"icfc", r"permeabil(ized|isation|ization) flow"]),
 	("ICC", [r"immunocytochemistry", r"\bicc\b", r"icc\s*\/\s*if", r"if-?icc"]),
@@ -24,16 +54,110 @@ _APP_PATTERNS = [
 	("FC", [r"flow cytometry", r"\bfacs\b", r"\bfcm\b"]),
 ]
 
+_APP_REGEXES = [(label, re.compile("|".join(pats))) for label, pats in _APP_PATTERNS]
+
+# Product page patterns; a package is a size followed closely by its price
+_CURRENCIES = {"$": "USD", "us$": "USD", "usd": "USD", "€": "EUR", "eur": "EUR", "£": "GBP", "gbp": "GBP"}
+_PRICE = r"(US\$|\$|€|£|USD|EUR|GBP)\s?(\d[\d,]*(?:\.\d{1,2})?)"
+_SIZE = r"(\d+(?:\.\d+)?)\s*(mg|[µμu]g|ml|[µμu]l)\b"
+_PACKAGE_RE = re.compile(_SIZE + r"[^$€£\d]{0,40}?" + _PRICE, re.IGNORECASE)
+_PRICE_RE = re.compile(_PRICE, re.IGNORECASE)
+_CONCENTRATION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*mg\s*/\s*ml", re.IGNORECASE)
+_CITATIONS_RE = re.compile(
+	r"(?:cited in|citations?|publications?|references?)\D{0,12}?(\d[\d,]*)|(\d[\d,]*)\s+(?:citations|publications|references)\b",
+	re.IGNORECASE,
+)
+_HOST_RE = re.compile(r"host\s*(?:species)?\s*:?\s*(rabbit|mouse|rat|goat|sheep|donkey|chicken|guinea pig|hamster)\b", re.IGNORECASE)
+_CONJUGATION_RE = re.compile(r"conjugat(?:e|ion)\s*:?\s*(unconjugated|alexa fluor®?\s*\d{3}|[a-z][\w\-]*)", re.IGNORECASE)
+
 
 class AbcamProvider:
 	name = "abcam"
+	# Record fields the listing pages fill and enrichment never changes
+	listing_fields = (
+		"validated_reactivity",
+		"clonality",
+		"clone",
+		"applications",
+		"formulation",
+		"is_bsa_free",
+		"is_gelatin_free",
+		"is_ascites_free",
+	)
 
-	def __init__(self, timeout_seconds: float = 20.0, use_headless: bool = False) -> None:
-		self._client = httpx.Client(timeout=timeout_seconds, headers={
-			"User-Agent": "AbSearch/0.1 (+https://github.com/johnblair7/AbSearch)",
-			"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-		})
+	def __init__(
+		self,
+		timeout_seconds: float = 20.0,
+		use_headless: bool = False,
+		max_connections: int = 10,
+		max_keepalive_connections: int = 10,
+		stop_early: bool = False,
+		async_client: Optional[httpx.AsyncClient] = None,
+		browser_pool: Optional[BrowserPool] = None,
+		browser_pool_size: int = 4,
+		cache: Optional[ResponseCache] = None,
+		fetcher: Optional[Fetcher] = None,
+		parser: Optional[ParseExecutor] = None,
+		parse_cache: Optional[ParseCache] = None,
+		endpoints: Optional[EndpointMemory] = None,
+		max_pages: int = DEFAULT_MAX_PAGES,
+		page_param: Optional[str] = None,
+	) -> None:
+		self._client: Optional[httpx.Client] = None
 		self._use_headless = use_headless
+		self._timeout_seconds = timeout_seconds
+		self._limits = httpx.Limits(
+			max_connections=max_connections,
+			max_keepalive_connections=max_keepalive_connections,
+		)
+		self._stop_early = stop_early
+		self._async_client = async_client
+		self._owns_async_client = async_client is None
+		self._browser_pool = browser_pool
+		self._browser_pool_size = browser_pool_size
+		self._owns_browser_pool = browser_pool is None
+		self._cache = cache
+		self._fetcher = fetcher if fetcher is not None else Fetcher()
+		self._parser = parser if parser is not None else ParseExecutor()
+		self._parse_cache = parse_cache if parse_cache is not None else ParseCache()
+		self._endpoints = endpoints if endpoints is not None else EndpointMemory()
+		self._max_pages = max(1, max_pages)
+		self._page_param = page_param
+
+	def _get_client(self) -> httpx.Client:
+		if self._client is None:
+			self._client = httpx.Client(timeout=self._timeout_seconds, headers=_DEFAULT_HEADERS)
+		return self._client
+
+	def _get_async_client(self) -> httpx.AsyncClient:
+		if self._async_client is None:
+			self._async_client = httpx.AsyncClient(
+				timeout=self._timeout_seconds,
+				headers=_DEFAULT_HEADERS,
+				limits=self._limits,
+				http2=_HTTP2_AVAILABLE,
+			)
+		return self._async_client
+
+	def _get_browser_pool(self) -> BrowserPool:
+		if self._browser_pool is None:
+			self._browser_pool = BrowserPool(
+				size=self._browser_pool_size,
+				timeout_ms=int(self._timeout_seconds * 1000),
+			)
+		return self._browser_pool
+
+	def metrics(self) -> Dict[str, Dict[str, object]]:
+		"""Per-host rate limiter, retry and circuit breaker state of the async fetch path."""
+		return self._fetcher.metrics()
+
+	async def aclose(self) -> None:
+		if self._async_client is not None and self._owns_async_client:
+			await self._async_client.aclose()
+			self._async_client = None
+		if self._browser_pool is not None and self._owns_browser_pool:
+			await self._browser_pool.close()
+			self._browser_pool = None
 
 	def _build_candidate_urls(self, target: str) -> List[str]:
 		params = [
@@ -47,6 +171,33 @@ class AbcamProvider:
 				urls.append(f"{base}?{key}={httpx.QueryParams({key: val})[key]}")
 		return urls
 
+	@staticmethod
+	def _variant(url: str) -> str:
+		# Base path and query key, without the target: ``.../primary-antibodies?keywords``
+		return url.partition("=")[0]
+
+	def _learned_url(self, urls: List[str]) -> Optional[str]:
+		variant = self._endpoints.get(self.name)
+		if variant is None:
+			return None
+		for url in urls:
+			if self._variant(url) == variant:
+				return url
+		return None
+
+	def _learn(self, url: str) -> None:
+		self._endpoints.remember(self.name, self._variant(url))
+
+	def _next_page_url(self, html: str, url: str, page: int) -> Optional[str]:
+		"""URL of the listing page after ``page``: the page's next link, else ``page_param`` set to ``page + 1``."""
+		m = _NEXT_LINK.search(html)
+		href = _HREF.search(m.group(0)) if m else None
+		if href:
+			return urljoin(url, unescape(href.group(1)))
+		if self._page_param:
+			return str(httpx.URL(url).copy_set_param(self._page_param, page + 1))
+		return None
+
 	def _extract_catalog(self, text: str, href: Optional[str]) -> Optional[str]:
 		patterns = [r"\bab\d{3,6}\b", r"/ab\d{3,6}\b"]
 		for pat in patterns:
@@ -80,21 +231,13 @@ class AbcamProvider:
 			return m.group(1)
 		return None
 
-	def _parse_apps(self, element: BeautifulSoup) -> List[str]:
-		text = element.get_text(" ", strip=True)
-		apps: List[str] = []
+	def _parse_apps(self, element: BeautifulSoup, text: Optional[str] = None) -> List[str]:
+		# Badge/chip text is a space-delimited slice of the element text, so a
+		# single scan of the element text finds every application they list.
+		if text is None:
+			text = element.get_text(" ", strip=True)
 		lower = text.lower()
-		for label, pats in _APP_PATTERNS:
-			for pat in pats:
-				if re.search(pat, lower):
-					apps.append(label)
-		for small in element.select("small, span, .badge, .chip"):
-			lt = (small.get_text(" ", strip=True) or "").lower()
-			for label, pats in _APP_PATTERNS:
-				for pat in pats:
-					if re.search(pat, lt):
-						apps.append(label)
-		return list(dict.fromkeys(apps))
+		return [label for label, regex in _APP_REGEXES if regex.search(lower)]
 
 	def _parse_formulation(self, text: str) -> tuple[Optional[str], Optional[bool], Optional[bool], Optional[bool]]:
 		formulation = None
@@ -119,26 +262,88 @@ class AbcamProvider:
 			formulation = m.group(0)
 		return formulation, is_bsa_free, is_gel_free, is_asc_free
 
-	def _parse_listings(self, html: str, target: str) -> List[AntibodyRecord]:
-		soup = BeautifulSoup(html, "html.parser")
-		results: List[AntibodyRecord] = []
+	def _find_cards(self, soup: BeautifulSoup) -> List[tuple[Tag, str]]:
+		"""Locate product cards in a single pass over the product links.
 
-		for card in soup.select("a, div"):
-			text = card.get_text(" ", strip=True)
-			href = card.get("href") if card.name == "a" else None
-			if not text:
+		Every ancestor of a product link is tagged with the catalog number it
+		contains, or as mixed once it holds two different products. A card is the
+		outermost ``a``/``div`` around a link that contains no other product, so
+		cards never overlap and each card's text is extracted exactly once.
+		"""
+		owners: Dict[int, object] = {}
+		links: List[tuple[Tag, str, str]] = []
+		for link in soup.find_all("a", href=True):
+			href = link.get("href")
+			if not href or ("/products/" not in href and "/ab" not in href.lower()):
+				continue
+			catalog = self._extract_catalog(link.get_text(" ", strip=True), href)
+			if not catalog:
 				continue
-			if href is None:
-				link = card.select_one("a[href]")
-				href = link.get("href") if link else None
-			if not href:
+			key = catalog.lower()
+			links.append((link, href, key))
+			node = link
+			while isinstance(node, Tag) and node.name != "[document]":
+				current = owners.get(id(node))
+				if current == key or current is _MIXED:
+					break
+				owners[id(node)] = key if current is None else _MIXED
+				node = node.parent
+
+		cards: List[tuple[Tag, str]] = []
+		seen_cards = set()
+		for link, href, key in links:
+			card = link
+			node = link.parent
+			while isinstance(node, Tag) and owners.get(id(node)) == key:
+				if node.name in ("a", "div"):
+					card = node
+				node = node.parent
+			if id(card) in seen_cards:
 				continue
-			if "/products/" not in href and "/ab" not in href.lower():
+			seen_cards.add(id(card))
+			cards.append((card, href))
+		return cards
+
+	def _parse_listings(
+		self,
+		html: str,
+		target: str,
+		known: AbstractSet[str] = frozenset(),
+		omitted: Optional[Set[str]] = None,
+	) -> List[RecordDraft]:
+		with span("parse.soup", provider=self.name, bytes=len(html)):
+			soup = BeautifulSoup(html, _PARSER_BACKEND)
+		with span("parse.cards", provider=self.name, target=target) as sp:
+			results = self._records_from_soup(soup, target, known, omitted)
+			sp.set(candidates=len(results))
+		return results
+
+	def _records_from_soup(
+		self,
+		soup: BeautifulSoup,
+		target: str,
+		known: AbstractSet[str] = frozenset(),
+		omitted: Optional[Set[str]] = None,
+	) -> List[RecordDraft]:
+		"""Build a record per product card, skipping cards whose lowercased catalog number is in ``known``.
+
+		Skipped catalog numbers are added to ``omitted`` when it is given.
+		"""
+		results: List[RecordDraft] = []
+
+		for card, href in self._find_cards(soup):
+			text = card.get_text(" ", strip=True)
+			if not text:
 				continue
 
 			catalog = self._extract_catalog(text, href)
 			if not catalog:
 				continue
+			# Already found on another page; skip the field extraction below
+			if catalog.lower() in known:
+				if omitted is not None:
+					omitted.add(catalog.lower())
+				continue
 
 			url = href
 			if url.startswith("/"):
@@ -148,10 +353,10 @@ class AbcamProvider:
 			reactivity = self._parse_reactivity(text)
 			clonality = self._parse_clonality(text)
 			clone = self._parse_clone(text) if clonality == "Monoclonal" else None
-			apps = self._parse_apps(card)
+			apps = self._parse_apps(card, text)
 			formulation, is_bsa_free, is_gel_free, is_asc_free = self._parse_formulation(text)
 
-			record = AntibodyRecord(
+			record = RecordDraft(
 				vendor="Abcam",
 				catalog_number=catalog,
 				name=name,
@@ -170,29 +375,560 @@ class AbcamProvider:
 
 		return results
 
-	def _fetch_listing_html(self, url: str) -> Optional[str]:
+	def _package_from(self, value: str, unit: str, symbol: str, price: str) -> PackageOption:
+		amount = float(value)
+		unit = unit.lower()
+		pkg = PackageOption(
+			label=f"{value} {unit.replace('u', 'µ').replace('μ', 'µ')}",
+			price=float(price.replace(",", "")),
+			currency=_CURRENCIES.get(symbol.lower()),
+		)
+		if unit == "mg":
+			pkg.amount_ug = amount * 1000
+		elif unit.endswith("g"):
+			pkg.amount_ug = amount
+		elif unit == "ml":
+			pkg.volume_ul = amount * 1000
+		else:
+			pkg.volume_ul = amount
+		return pkg
+
+	def _parse_detail(self, html: str) -> Dict[str, object]:
+		"""Extract package, price, citation, host and conjugation fields from a product page."""
+		with span("parse.detail", provider=self.name, bytes=len(html)):
+			text = BeautifulSoup(html, _PARSER_BACKEND).get_text(" ", strip=True)
+		details: Dict[str, object] = {}
+
+		concentration = None
+		m = _CONCENTRATION_RE.search(text)
+		if m:
+			concentration = float(m.group(1))
+			details["concentration_mg_per_ml"] = concentration
+
+		packages: List[PackageOption] = []
+		seen_labels = set()
+		for m in _PACKAGE_RE.finditer(text):
+			pkg = self._package_from(*m.groups())
+			if pkg.label in seen_labels:
+				continue
+			seen_labels.add(pkg.label)
+			if pkg.volume_ul is not None:
+				pkg.concentration_mg_per_ml = concentration
+			packages.append(pkg)
+		if packages:
+			# The first option listed on the page is the product's default size
+			primary = packages[0]
+			details.update(
+				package_options=packages,
+				size=primary.label,
+				price=primary.price,
+				currency=primary.currency,
+				amount_ug=primary.amount_ug,
+				volume_ul=primary.volume_ul,
+			)
+		else:
+			m = _PRICE_RE.search(text)
+			if m:
+				details["price"] = float(m.group(2).replace(",", ""))
+				details["currency"] = _CURRENCIES.get(m.group(1).lower())
+
+		m = _CITATIONS_RE.search(text)
+		if m:
+			details["citations_count"] = int((m.group(1) or m.group(2)).replace(",", ""))
+
+		m = _HOST_RE.search(text)
+		if m:
+			details["host_species"] = m.group(1).capitalize()
+
+		m = _CONJUGATION_RE.search(text)
+		if m and m.group(1).lower() != "unconjugated":
+			details["conjugation"] = m.group(1)
+
+		return details
+
+	async def aenrich(self, record: RecordDraft) -> RecordDraft:
+		"""Fill price, package, amount and citation fields from the product page.
+
+		The page goes through the same cached fetch path as listings and is
+		parsed on a worker thread. Fields the listing already set are kept, and
+		the record comes back unchanged if the page cannot be fetched.
+		"""
+		if not record.url:
+			return record
 		try:
-			if self._use_headless:
-				return fetch_html(url, wait_selector="body")
-			resp = self._client.get(url)
-			if resp.status_code == 200:
-				return resp.text
+			html = await self._afetch_html(record.url)
 		except Exception:
-			return None
+			return record
+		if not html:
+			return record
+		details = await self._parser.run(_parse_detail_in_worker, html, size=len(html))
+		for key, value in details.items():
+			if getattr(record, key) in (None, []):
+				setattr(record, key, value)
+		return record
+
+	def _cache_namespace(self) -> str:
+		return f"{self.name}:headless" if self._use_headless else self.name
+
+	def _cached_entry(self, url: str) -> tuple[Optional[CachedResponse], Optional[str]]:
+		"""Return the cached entry for ``url`` and its body if it is still fresh."""
+		if self._cache is None:
+			return None, None
+		entry = self._cache.get(self._cache_namespace(), url)
+		if entry is not None and self._cache.is_fresh(self._cache_namespace(), entry):
+			return entry, entry.body
+		return entry, None
+
+	def _handle_response(self, url: str, resp: httpx.Response, entry: Optional[CachedResponse]) -> Optional[str]:
+		if resp.status_code == 304 and entry is not None:
+			self._cache.mark_revalidated(self._cache_namespace(), url)
+			return entry.body
+		if resp.status_code == 200:
+			if self._cache is not None:
+				self._cache.put(
+					self._cache_namespace(),
+					url,
+					resp.text,
+					etag=resp.headers.get("etag"),
+					last_modified=resp.headers.get("last-modified"),
+				)
+			return resp.text
 		return None
 
-	def search(self, target: str) -> Iterable[AntibodyRecord]:
-		urls = self._build_candidate_urls(target)
+	def _store_rendered(self, url: str, html: str) -> str:
+		if self._cache is not None and html:
+			self._cache.put(self._cache_namespace(), url, html)
+		return html
+
+	def _fetch_html(self, url: str) -> Optional[str]:
+		"""Blocking counterpart of ``_afetch_html``, without the rate limiter or retries.
+
+		Returns None for pages that do not exist; throttling, server, transport
+		and rendering failures are raised.
+		"""
+		with span("fetch", provider=self.name, url=url) as sp:
+			try:
+				entry, fresh = self._cached_entry(url)
+				if fresh is not None:
+					sp.set(cache="fresh", bytes=len(fresh))
+					return fresh
+				if self._use_headless:
+					html = self._store_rendered(url, fetch_html(url, wait_selector="body"))
+					sp.set(headless=True, bytes=len(html))
+					return html
+				headers = entry.conditional_headers() if entry is not None else None
+				resp = self._get_client().get(url, headers=headers)
+				sp.set(status=resp.status_code, bytes=len(resp.content))
+				if resp.status_code == 429 or resp.status_code >= 500:
+					raise FetchError(f"HTTP {resp.status_code} from {url}", url, resp.status_code, retryable=True)
+				return self._handle_response(url, resp, entry)
+			except Exception as exc:
+				sp.set(error=type(exc).__name__)
+				raise
+
+	async def _afetch_html(self, url: str, revalidate: bool = False) -> Optional[str]:
+		"""Fetch a page through the cache and the rate-limited fetcher.
+
+		Returns None for pages that do not exist; throttling, server and
+		transport failures that outlast the retries are raised. With
+		``revalidate`` a fresh cached body is not trusted: the page is requested
+		again, conditionally on the cached validators.
+		"""
+		with span("fetch", provider=self.name, url=url) as sp:
+			entry, fresh = self._cached_entry(url)
+			if fresh is not None and not revalidate:
+				sp.set(cache="fresh", bytes=len(fresh))
+				return fresh
+			if self._use_headless:
+				try:
+					html = await self._get_browser_pool().fetch_html(url, wait_selector="body")
+				except Exception as exc:
+					sp.set(error=type(exc).__name__)
+					raise
+				sp.set(headless=True, bytes=len(html))
+				return self._store_rendered(url, html)
+			headers = entry.conditional_headers() if entry is not None else None
+			resp = await self._fetcher.get(self._get_async_client(), url, headers=headers)
+			sp.set(status=resp.status_code, bytes=len(resp.content))
+			return self._handle_response(url, resp, entry)
+
+	def _merge(self, pages: Iterable[List[RecordDraft]]) -> List[RecordDraft]:
 		seen_catalogs = set()
-		collected: List[AntibodyRecord] = []
-		for url in urls:
-			html = self._fetch_listing_html(url)
-			if not html:
-				continue
-			records = self._parse_listings(html, target)
+		collected: List[RecordDraft] = []
+		for records in pages:
 			for r in records:
 				if r.catalog_number.lower() in seen_catalogs:
+					count(f"records.deduped.{self.name}")
 					continue
 				seen_catalogs.add(r.catalog_number.lower())
 				collected.append(r)
 		return collected
+
+	def listing_urls(self, target: str) -> List[str]:
+		return self._build_candidate_urls(target)
+
+	def parse_page(self, html: str, target: str) -> List[RecordDraft]:
+		return self._parse_listings(html, target)
+
+	async def aparse_page(self, html: str, target: str, known: AbstractSet[str] = frozenset()) -> List[RecordDraft]:
+		"""Parse a listing page through the parse cache and executor (worker thread or process pool).
+
+		Records whose catalog number is in ``known`` are left out, and cards
+		for them are skipped before field extraction when the page is parsed.
+		"""
+		return await self._aparse_listing(html, target, body_hash(html), known)
+
+	def _cached_parse(self, digest: str, target: str, known: AbstractSet[str]) -> Optional[List[RecordDraft]]:
+		records = self._parse_cache.get(digest, target, known)
+		if records is not None:
+			count(f"parse.cache_hits.{self.name}")
+		return records
+
+	@staticmethod
+	def _unknown(records: List[RecordDraft], known: AbstractSet[str]) -> List[RecordDraft]:
+		if not known:
+			return records
+		return [r for r in records if r.catalog_number.lower() not in known]
+
+	async def _aparse_listing(self, html: str, target: str, digest: str, known: AbstractSet[str]) -> List[RecordDraft]:
+		"""Records on the page not in ``known``, from the parse cache or a parse that skips ``known`` cards."""
+		records = self._cached_parse(digest, target, known)
+		if records is not None:
+			return self._unknown(records, known)
+		records, omitted = await self._parser.run(_parse_listings_in_worker, html, target, known, size=len(html))
+		self._parse_cache.put(digest, target, records, omitted)
+		return records
+
+	def _parse_listing(self, html: str, target: str, digest: str, known: AbstractSet[str]) -> List[RecordDraft]:
+		records = self._cached_parse(digest, target, known)
+		if records is not None:
+			return self._unknown(records, known)
+		omitted: Set[str] = set()
+		records = self._parse_listings(html, target, known, omitted)
+		self._parse_cache.put(digest, target, records, omitted)
+		return records
+
+	async def afetch_page(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[FetchedPage]:
+		"""Fetch one listing page, conditionally when validators are given.
+
+		With a response cache or headless rendering the page goes through the
+		normal fetch path and always comes back as a 200 body. The cache's
+		freshness is bypassed, so a refresh always asks the vendor (conditionally
+		on the cached validators) rather than rereading a body cached within the
+		TTL. Returns None when the page could not be fetched, even after retries.
+		"""
+		try:
+			if self._cache is not None or self._use_headless:
+				html = await self._afetch_html(url, revalidate=True)
+				return FetchedPage(url, 200, html) if html else None
+			headers: Dict[str, str] = {}
+			if etag:
+				headers["If-None-Match"] = etag
+			if last_modified:
+				headers["If-Modified-Since"] = last_modified
+			resp = await self._fetcher.get(self._get_async_client(), url, headers=headers)
+		except Exception:
+			return None
+		if resp.status_code == 304:
+			return FetchedPage(url, 304, None, etag, last_modified)
+		if resp.status_code == 200:
+			return FetchedPage(url, 200, resp.text, resp.headers.get("etag"), resp.headers.get("last-modified"))
+		return None
+
+	def search(self, target: str) -> Iterable[RecordDraft]:
+		"""Yield records page by page as each candidate URL is fetched and parsed.
+
+		The variant that last returned listings is tried first; the others are
+		probed only if it yields nothing. Each variant's next pages are followed
+		one after another, up to ``max_pages``, until a page adds nothing new.
+		If every variant fails to fetch, the first failure is raised.
+		"""
+		urls = self._build_candidate_urls(target)
+		learned = self._learned_url(urls)
+		if learned is not None:
+			found = False
+			try:
+				for r in self._search_urls(target, [learned]):
+					found = True
+					yield r
+			except Exception:
+				# Nothing was yielded if the only page failed to fetch
+				pass
+			if found:
+				count(f"endpoints.hits.{self.name}")
+				return
+			count(f"endpoints.fallback.{self.name}")
+			urls = [url for url in urls if url != learned]
+		yield from self._search_urls(target, urls)
+
+	def _search_urls(self, target: str, urls: List[str]) -> Iterable[RecordDraft]:
+		seen_catalogs = set()
+		seen_bodies = set()
+		learned = False
+		errors: List[Exception] = []
+		fetched = 0
+		for start in urls:
+			url: Optional[str] = start
+			for page in range(1, self._max_pages + 1):
+				try:
+					html = self._fetch_html(url)
+				except Exception as exc:
+					# Only the first page decides whether a variant failed
+					if page == 1:
+						errors.append(exc)
+					break
+				if page == 1:
+					fetched += 1
+				if not html:
+					break
+				# Several query keys often return the very same listing
+				digest = body_hash(html)
+				if digest in seen_bodies:
+					count(f"pages.duplicate.{self.name}")
+					break
+				seen_bodies.add(digest)
+				records = self._parse_listing(html, target, digest, frozenset(seen_catalogs))
+				if not records:
+					break
+				if not learned:
+					self._learn(start)
+					learned = True
+				for r in records:
+					if r.catalog_number.lower() in seen_catalogs:
+						count(f"records.deduped.{self.name}")
+						continue
+					seen_catalogs.add(r.catalog_number.lower())
+					yield r
+				url = self._next_page_url(html, url, page) if page < self._max_pages else None
+				if url is None:
+					break
+				count(f"pages.followed.{self.name}")
+		if errors and not fetched:
+			raise errors[0]
+
+	async def _crawl(
+		self,
+		target: str,
+		url: str,
+		html: Optional[str],
+		claim: Callable[[str], bool],
+		known: Callable[[], AbstractSet[str]],
+		emit: Callable[[List[RecordDraft]], Awaitable[None]],
+	) -> None:
+		"""Parse the fetched page at ``url`` and the listing pages after it, handing each page's records to ``emit``.
+
+		The next page is fetched while the current one is parsed. The crawl ends
+		after ``max_pages`` pages, at a page ``claim`` rejects as already seen, at
+		a page with no catalog numbers outside ``known()`` and the crawl's earlier
+		pages, or at a next page that fails to fetch.
+		"""
+		found = set()
+		for page in range(1, self._max_pages + 1):
+			if not html:
+				return
+			digest = body_hash(html)
+			if not claim(digest):
+				count(f"pages.duplicate.{self.name}")
+				return
+			next_url = self._next_page_url(html, url, page) if page < self._max_pages else None
+			ahead: List[Optional[str]] = [None]
+
+			async def _prefetch(next_url: str) -> None:
+				try:
+					ahead[0] = await self._afetch_html(next_url)
+				except Exception:
+					pass
+
+			async with anyio.create_task_group() as tg:
+				if next_url is not None:
+					tg.start_soon(_prefetch, next_url)
+				records = await self._aparse_listing(html, target, digest, known() | found)
+				if not records:
+					# Nothing new on this page, so stop paging
+					tg.cancel_scope.cancel()
+					return
+				found.update(r.catalog_number.lower() for r in records)
+				await emit(records)
+			if next_url is None:
+				return
+			count(f"pages.followed.{self.name}")
+			url, html = next_url, ahead[0]
+
+	async def asearch(self, target: str) -> List[RecordDraft]:
+		"""Fetch the candidate URLs concurrently on the shared async client.
+
+		If a variant is known to work for this provider only its URL is fetched;
+		the remaining variants are probed, as below, when it fails or yields no
+		listings. The first variant with listings is remembered for later searches.
+
+		Each variant's listing is followed through its next pages as described
+		in ``_crawl``.
+
+		With ``stop_early`` the remaining requests are cancelled as soon as one
+		variant yields listings. Results are merged in candidate-URL order. If
+		every variant fails to fetch, the first failure is raised instead of
+		returning an empty list.
+
+		A page identical to an earlier variant's is not parsed, and cards already
+		parsed from earlier variants are skipped; either would lose the merge anyway.
+		"""
+		urls = self._build_candidate_urls(target)
+		learned = self._learned_url(urls)
+		if learned is not None:
+			try:
+				records = await self._asearch_urls(target, [learned])
+			except Exception:
+				records = []
+			if records:
+				count(f"endpoints.hits.{self.name}")
+				return records
+			count(f"endpoints.fallback.{self.name}")
+			urls = [url for url in urls if url != learned]
+		return await self._asearch_urls(target, urls)
+
+	async def _asearch_urls(self, target: str, urls: List[str]) -> List[RecordDraft]:
+		pages: List[List[RecordDraft]] = [[] for _ in urls]
+		owners: Dict[str, int] = {}
+		scopes = [anyio.CancelScope() for _ in urls]
+		errors: List[Exception] = []
+		fetched = 0
+
+		async def _fetch(index: int, url: str) -> None:
+			nonlocal fetched
+
+			def claim(digest: str) -> bool:
+				# Leave a page to the lowest-indexed variant that fetched it
+				if owners.get(digest, len(urls)) <= index:
+					return False
+				owners[digest] = index
+				return True
+
+			def known() -> AbstractSet[str]:
+				return frozenset(r.catalog_number.lower() for page in pages[:index] for r in page)
+
+			async def emit(records: List[RecordDraft]) -> None:
+				pages[index].extend(records)
+				if self._stop_early:
+					for other, scope in enumerate(scopes):
+						if other != index:
+							scope.cancel()
+
+			with scopes[index]:
+				try:
+					html = await self._afetch_html(url)
+				except Exception as exc:
+					errors.append(exc)
+					return
+				fetched += 1
+				await self._crawl(target, url, html, claim, known, emit)
+
+		async with anyio.create_task_group() as tg:
+			for i, url in enumerate(urls):
+				tg.start_soon(_fetch, i, url)
+
+		if errors and not fetched:
+			raise errors[0]
+		for url, records in zip(urls, pages):
+			if records:
+				self._learn(url)
+				break
+		return self._merge(pages)
+
+	async def astream(self, target: str, send: anyio.abc.ObjectSendStream) -> None:
+		"""Send records to ``send`` as soon as each concurrently fetched page is parsed.
+
+		Like ``asearch``, a variant known to work is fetched alone first and the
+		others are probed only when it fails or yields no listings. Later pages
+		of a listing are sent as each is parsed, while the one after it is
+		already being fetched.
+
+		Pages arrive in completion order, so duplicates across variants keep the
+		first copy seen rather than the first in candidate-URL order. The stream
+		is left open for the caller to close. As with ``asearch``, the first
+		failure is raised if no variant was fetched, and repeated pages and
+		already sent cards are not parsed again.
+		"""
+		urls = self._build_candidate_urls(target)
+		learned = self._learned_url(urls)
+		if learned is not None:
+			try:
+				sent = await self._astream_urls(target, [learned], send)
+			except Exception:
+				# Nothing was sent if the only page failed to fetch
+				sent = 0
+			if sent:
+				count(f"endpoints.hits.{self.name}")
+				return
+			count(f"endpoints.fallback.{self.name}")
+			urls = [url for url in urls if url != learned]
+		await self._astream_urls(target, urls, send)
+
+	async def _astream_urls(self, target: str, urls: List[str], send: anyio.abc.ObjectSendStream) -> int:
+		"""Crawl ``urls`` concurrently, sending new records to ``send``; returns how many were sent."""
+		scopes = [anyio.CancelScope() for _ in urls]
+		errors: List[Exception] = []
+		fetched = 0
+		sent = 0
+		seen_catalogs = set()
+		seen_bodies = set()
+
+		def claim(digest: str) -> bool:
+			if digest in seen_bodies:
+				return False
+			seen_bodies.add(digest)
+			return True
+
+		def known() -> AbstractSet[str]:
+			return frozenset(seen_catalogs)
+
+		async def _fetch(index: int, url: str) -> None:
+			nonlocal fetched
+
+			async def emit(records: List[RecordDraft]) -> None:
+				nonlocal sent
+				if not sent:
+					self._learn(url)
+				for r in records:
+					if r.catalog_number.lower() in seen_catalogs:
+						count(f"records.deduped.{self.name}")
+						continue
+					seen_catalogs.add(r.catalog_number.lower())
+					sent += 1
+					await send.send(r)
+				if self._stop_early:
+					for other, scope in enumerate(scopes):
+						if other != index:
+							scope.cancel()
+
+			with scopes[index]:
+				try:
+					html = await self._afetch_html(url)
+				except Exception as exc:
+					errors.append(exc)
+					return
+				fetched += 1
+				await self._crawl(target, url, html, claim, known, emit)
+
+		async with anyio.create_task_group() as tg:
+			for i, url in enumerate(urls):
+				tg.start_soon(_fetch, i, url)
+		if errors and not fetched:
+			raise errors[0]
+		return sent
+
+
+@lru_cache(maxsize=1)
+def _parser() -> AbcamProvider:
+	# Parsing only reads class-level patterns, so one instance per process serves every call
+	return AbcamProvider()
+
+
+def _parse_listings_in_worker(html: str, target: str, known: AbstractSet[str] = frozenset()) -> Tuple[List[RecordDraft], FrozenSet[str]]:
+	"""The page's records not in ``known``, and the known catalog numbers whose cards were skipped."""
+	omitted: Set[str] = set()
+	records = _parser()._parse_listings(html, target, known, omitted)
+	return records, frozenset(omitted)
+
+
+def _parse_detail_in_worker(html: str) -> Dict[str, object]:
+	return _parser()._parse_detail(html)
@@ -1,12 +1,54 @@
 from __future__ import annotations
 
-from typing import Iterable, Protocol
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Protocol
 
-from ..models import AntibodyRecord
+from ..models import AnyRecord, RecordDraft
+
+
+# Listing pages a paginating provider follows per search URL, counting the first
+DEFAULT_MAX_PAGES = 10
 
 
 class AntibodyProvider(Protocol):
+	"""Vendor search interface.
+
+	Providers may additionally define ``async def asearch(target)`` returning
+	records, and ``async def astream(target, send)`` sending them to an anyio
+	object stream as they are found (the caller owns and closes the stream);
+	the search engine prefers these over running ``search`` on a worker thread.
+	Records may be ``AntibodyRecord`` or unvalidated ``RecordDraft`` objects.
+	"""
+
 	name: str
 
-	def search(self, target: str) -> Iterable[AntibodyRecord]:
+	def search(self, target: str) -> Iterable[AnyRecord]:
+		...
+
+
+@dataclass
+class FetchedPage:
+	url: str
+	status_code: int
+	body: Optional[str] = None
+	etag: Optional[str] = None
+	last_modified: Optional[str] = None
+
+	@property
+	def not_modified(self) -> bool:
+		return self.status_code == 304
+
+
+class PagedProvider(AntibodyProvider, Protocol):
+	"""Provider exposing its listing pages, which enables incremental refresh."""
+
+	def listing_urls(self, target: str) -> List[str]:
+		...
+
+	async def afetch_page(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Optional[FetchedPage]:
+		...
+
+	def parse_page(self, html: str, target: str) -> List[RecordDraft]:
 		...
+
+	# Optionally also ``async def aparse_page(html, target)`` to parse off the event loop
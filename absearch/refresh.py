@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import anyio
+
+from .catalog import CatalogStore, PageState
+from .models import AntibodyRecord, AnyRecord, promote
+from .ordering import invalidate
+from .parsing import body_hash
+from .providers import AntibodyProvider
+from .profiling import span
+from .search import DEFAULT_DETAIL_CONCURRENCY, DEFAULT_MAX_CONCURRENCY, aclose_providers
+
+
+@dataclass
+class TargetDelta:
+	target: str
+	added: List[AntibodyRecord] = field(default_factory=list)
+	changed: List[AntibodyRecord] = field(default_factory=list)
+	# (vendor, catalog_number) of records no longer listed
+	removed: List[Tuple[str, str]] = field(default_factory=list)
+	pages_parsed: int = 0
+	pages_unchanged: int = 0
+	pages_failed: int = 0
+	provider_status: Dict[str, str] = field(default_factory=dict)
+
+
+def _listing_changed(record: AntibodyRecord, stored: AntibodyRecord) -> bool:
+	"""Whether a field the listing filled differs from the stored record.
+
+	Fields the listing left empty are not compared: enrichment fills those from
+	the product page. ``target`` is whichever search stored the record last.
+	"""
+	for name, value in record:
+		if name == "target" or value is None or value == []:
+			continue
+		if getattr(stored, name) != value:
+			return True
+	return False
+
+
+def _carry_over(record: AntibodyRecord, stored: AntibodyRecord) -> AntibodyRecord:
+	"""``record`` with every field it leaves empty taken from ``stored``.
+
+	A changed record is stored without its enrichment when enrichment is off
+	or its product page could not be fetched; this keeps the stored price,
+	packages and citations instead of wiping them.
+	"""
+	updates = {
+		name: getattr(stored, name)
+		for name, value in record
+		if value in (None, [], {}) and getattr(stored, name) not in (None, [], {})
+	}
+	if not updates:
+		return record
+	merged = record.model_copy(update=updates)
+	invalidate(merged)
+	return merged
+
+
+async def _apply(
+	store: CatalogStore,
+	delta: TargetDelta,
+	records: Sequence[AnyRecord],
+	provider: AntibodyProvider,
+	detail_limiter: Optional[anyio.CapacityLimiter] = None,
+) -> None:
+	"""Diff freshly parsed records against the catalog and store the new and changed ones.
+
+	Stored records carry what enrichment added, so only listing fields are
+	compared. With a ``detail_limiter``, new and changed records are enriched
+	from their product pages before they are stored, as a harvest stores them;
+	fields a changed record still leaves empty keep their stored values.
+	"""
+	candidates: Dict[Tuple[str, str], AnyRecord] = {}
+	seen = set()
+	for draft in records:
+		key = (draft.vendor, draft.catalog_number)
+		if (draft.vendor, draft.catalog_number.lower()) in seen:
+			continue
+		seen.add((draft.vendor, draft.catalog_number.lower()))
+		candidates[key] = draft
+
+	stored = store.records(candidates)
+	added: List[AnyRecord] = []
+	changed: List[AnyRecord] = []
+	for key, draft in candidates.items():
+		if key not in stored:
+			added.append(draft)
+		elif _listing_changed(promote(draft), stored[key]):
+			changed.append(draft)
+
+	aenrich = getattr(provider, "aenrich", None)
+	if detail_limiter is not None and aenrich is not None:
+		async def _enrich(batch: List[AnyRecord], index: int) -> None:
+			async with detail_limiter:
+				with span("enrich", provider=provider.name, catalog=batch[index].catalog_number):
+					batch[index] = await aenrich(batch[index])
+
+		async with anyio.create_task_group() as tg:
+			for batch in (added, changed):
+				for index in range(len(batch)):
+					tg.start_soon(_enrich, batch, index)
+
+	added_records = [promote(r) for r in added]
+	changed_records = [_carry_over(promote(r), stored[(r.vendor, r.catalog_number)]) for r in changed]
+	delta.added.extend(added_records)
+	delta.changed.extend(changed_records)
+	store.upsert(added_records + changed_records)
+
+
+async def _refresh_paged(
+	store: CatalogStore,
+	provider,
+	target: str,
+	delta: TargetDelta,
+	detail_limiter: Optional[anyio.CapacityLimiter] = None,
+) -> None:
+	previous = store.page_states(provider.name, target)
+	urls = provider.listing_urls(target)
+	pages: Dict[str, PageState] = {}
+	parsed: Dict[str, List[AnyRecord]] = {}
+
+	async def _fetch(url: str) -> None:
+		prev = previous.get(url)
+		page = await provider.afetch_page(
+			url,
+			etag=prev.etag if prev else None,
+			last_modified=prev.last_modified if prev else None,
+		)
+		if page is None or (page.not_modified and prev is None):
+			delta.pages_failed += 1
+			if prev is not None:
+				pages[url] = prev
+			return
+		if page.not_modified:
+			delta.pages_unchanged += 1
+			pages[url] = prev
+			return
+		digest = body_hash(page.body)
+		if prev is not None and prev.body_hash == digest:
+			delta.pages_unchanged += 1
+			pages[url] = PageState(digest, page.etag or prev.etag, page.last_modified or prev.last_modified, prev.catalogs)
+			return
+		aparse = getattr(provider, "aparse_page", None)
+		records = await aparse(page.body, target) if aparse is not None else provider.parse_page(page.body, target)
+		delta.pages_parsed += 1
+		parsed[url] = records
+		pages[url] = PageState(digest, page.etag, page.last_modified, [(r.vendor, r.catalog_number) for r in records])
+
+	async with anyio.create_task_group() as tg:
+		for url in urls:
+			tg.start_soon(_fetch, url)
+
+	await _apply(store, delta, [r for url in urls for r in parsed.get(url, [])], provider, detail_limiter)
+
+	# Pages that failed keep their previous listing, so a flaky fetch never reads as a removal
+	current = {key for state in pages.values() for key in state.catalogs}
+	before = {key for state in previous.values() for key in state.catalogs}
+	store.save_page_states(provider.name, target, pages)
+	# A product dropped from this target's pages may still be listed under another target
+	removed = store.unlisted(sorted(before - current))
+	store.delete(removed)
+	delta.removed.extend(removed)
+
+
+async def _refresh_full(
+	store: CatalogStore,
+	provider: AntibodyProvider,
+	target: str,
+	delta: TargetDelta,
+	detail_limiter: Optional[anyio.CapacityLimiter] = None,
+) -> None:
+	asearch = getattr(provider, "asearch", None)
+	if asearch is not None:
+		records = list(await asearch(target))
+	else:
+		records = await anyio.to_thread.run_sync(lambda: list(provider.search(target)))
+	delta.pages_parsed += 1
+	await _apply(store, delta, records, provider, detail_limiter)
+
+
+async def refresh_target(
+	store: CatalogStore,
+	providers: Sequence[AntibodyProvider],
+	target: str,
+	detail_limiter: Optional[anyio.CapacityLimiter] = None,
+) -> TargetDelta:
+	"""Refresh one target in the catalog and report only what changed.
+
+	Providers exposing their listing pages (``PagedProvider``) are refreshed
+	page by page: pages are requested conditionally with their stored ETag and
+	Last-Modified, and a 304 or an unchanged body hash skips parsing entirely.
+	Parsed records are compared with the catalog on the fields listings fill,
+	new and changed ones are enriched from their product pages, and records
+	no longer listed on any stored page, of this target or any other, are
+	removed. Other providers are searched in full and diffed the same way,
+	without removals.
+	"""
+	delta = TargetDelta(target=target)
+	for provider in providers:
+		paged = all(hasattr(provider, attr) for attr in ("listing_urls", "afetch_page", "parse_page"))
+		try:
+			if paged:
+				await _refresh_paged(store, provider, target, delta, detail_limiter)
+			else:
+				await _refresh_full(store, provider, target, delta, detail_limiter)
+			delta.provider_status[provider.name] = "ok"
+		except Exception as exc:
+			delta.provider_status[provider.name] = f"error: {type(exc).__name__}: {exc}"
+	return delta
+
+
+async def refresh_many(
+	store: CatalogStore,
+	targets: Sequence[str],
+	providers: Sequence[AntibodyProvider],
+	max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+	enrich: bool = True,
+	detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+) -> Dict[str, TargetDelta]:
+	limiter = anyio.CapacityLimiter(max(1, max_concurrency))
+	# Shared by every target, so product page fetches stay bounded across the run
+	detail_limiter = anyio.CapacityLimiter(max(1, detail_concurrency)) if enrich else None
+	results: Dict[str, TargetDelta] = {}
+
+	async def _collect(target: str) -> None:
+		async with limiter:
+			results[target] = await refresh_target(store, providers, target, detail_limiter)
+
+	unique_targets = list(dict.fromkeys(targets))
+	async with anyio.create_task_group() as tg:
+		for target in unique_targets:
+			tg.start_soon(_collect, target)
+	return {target: results[target] for target in unique_targets}
+
+
+def refresh_many_sync(
+	store: CatalogStore,
+	targets: Sequence[str],
+	providers: Sequence[AntibodyProvider],
+	max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+	enrich: bool = True,
+	detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+) -> Dict[str, TargetDelta]:
+	async def _run() -> Dict[str, TargetDelta]:
+		try:
+			return await refresh_many(
+				store,
+				targets,
+				providers,
+				max_concurrency=max_concurrency,
+				enrich=enrich,
+				detail_concurrency=detail_concurrency,
+			)
+		finally:
+			await aclose_providers(providers)
+
+	return anyio.run(_run)
@@ -1,14 +1,78 @@
 from __future__ import annotations
 
-from typing import List, Sequence
+import inspect
+from contextlib import AsyncExitStack
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from .models import AntibodyRecord
-from .providers import AbcamProvider, AntibodyProvider, MockProvider
+import anyio
+from anyio.abc import ObjectSendStream
 
+from .cache import ResponseCache
+from .endpoints import EndpointMemory
+from .filters import record_matches_criteria, restrict_criteria
+from .models import AnyRecord, Criteria, TargetResult
+from .parsing import ParseExecutor
+from .ordering import TopK, best_possible_key, invalidate
+from .profiling import count, span
+from .providers import AntibodyProvider, load_provider
 
-def get_providers(names: Sequence[str] | None) -> List[AntibodyProvider]:
+
+DEFAULT_PROVIDER_TIMEOUT = 60.0
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_PER_PROVIDER_CONCURRENCY = 4
+DEFAULT_DETAIL_CONCURRENCY = 8
+
+# Records a provider may run ahead of whoever consumes its listing
+_STREAM_BUFFER = 64
+
+# Callback receiving records as they are produced; always invoked on the event loop thread
+RecordSink = Callable[[AnyRecord], None]
+
+
+def _instantiate(
+	cls: type,
+	use_headless: bool = False,
+	cache: Optional[ResponseCache] = None,
+	parser: Optional[ParseExecutor] = None,
+	endpoints: Optional[EndpointMemory] = None,
+	max_pages: Optional[int] = None,
+) -> AntibodyProvider:
+	params = inspect.signature(cls).parameters
+	kwargs: Dict[str, object] = {}
+	if "cache" in params:
+		kwargs["cache"] = cache
+	if parser is not None and "parser" in params:
+		kwargs["parser"] = parser
+	if endpoints is not None and "endpoints" in params:
+		kwargs["endpoints"] = endpoints
+	if max_pages is not None and "max_pages" in params:
+		kwargs["max_pages"] = max_pages
+	if use_headless and "use_headless" in params:
+		kwargs["use_headless"] = True
+	return cls(**kwargs)
+
+
+def _default_providers() -> List[AntibodyProvider]:
+	return [_instantiate(load_provider("abcam"))]
+
+
+def get_providers(
+	names: Sequence[str] | None,
+	cache: Optional[ResponseCache] = None,
+	parser: Optional[ParseExecutor] = None,
+	endpoints: Optional[EndpointMemory] = None,
+	max_pages: Optional[int] = None,
+) -> List[AntibodyProvider]:
+	"""Build providers from ``name`` or ``name:headless`` specs, importing only the ones named.
+
+	Names resolve through ``providers.load_provider`` (built-ins, then entry
+	points); unknown names are skipped. Providers accepting a ``parser`` share
+	the given parse executor, and those accepting ``endpoints`` record the URL
+	variants they learn in it. ``max_pages`` bounds how many listing pages
+	paginating providers follow per URL.
+	"""
 	if not names:
-		return [AbcamProvider()]
+		return [_instantiate(load_provider("abcam"), cache=cache, parser=parser, endpoints=endpoints, max_pages=max_pages)]
 
 	providers: List[AntibodyProvider] = []
 	for n in names:
@@ -18,18 +82,415 @@ def get_providers(names: Sequence[str] | None) -> List[AntibodyProvider]:
 			name, _, mode = n.partition(":")
 			use_headless = (mode.lower() == "headless")
 
-		if name.lower() == "abcam":
-			providers.append(AbcamProvider(use_headless=use_headless))
-		elif name.lower() == "mock":
-			providers.append(MockProvider())
+		try:
+			cls = load_provider(name)
+		except KeyError:
+			continue
+		providers.append(_instantiate(cls, use_headless=use_headless, cache=cache, parser=parser, endpoints=endpoints, max_pages=max_pages))
 	return providers
 
 
-def search_all_sync(target: str, providers: Sequence[AntibodyProvider] | None = None) -> List[AntibodyRecord]:
+def _first_error(exc: BaseException) -> BaseException:
+	"""The first failure inside the exception groups task groups wrap errors in."""
+	while getattr(exc, "exceptions", None):
+		exc = exc.exceptions[0]
+	return exc
+
+
+def _drain(records: Iterable[AnyRecord], sink: RecordSink) -> None:
+	"""Feed a sync provider's records to ``sink`` on the event loop, one at a time."""
+	for record in records:
+		anyio.from_thread.run_sync(sink, record)
+
+
+async def _listing(provider: AntibodyProvider, target: str, send: ObjectSendStream) -> None:
+	"""Send the provider's listing records to ``send``, preferring ``astream``, then ``asearch``."""
+	astream = getattr(provider, "astream", None)
+	asearch = getattr(provider, "asearch", None)
+	if astream is not None:
+		await astream(target, send)
+	elif asearch is not None:
+		for record in await asearch(target):
+			await send.send(record)
+	else:
+		for record in await anyio.to_thread.run_sync(lambda: list(provider.search(target)), abandon_on_cancel=True):
+			await send.send(record)
+
+
+async def _consume(provider: AntibodyProvider, target: str, handle: Callable[[AnyRecord], None]) -> None:
+	"""Run the provider's listing in a child task and pass each record to ``handle`` on this one.
+
+	The task group and stream live here rather than in an async generator, so
+	an exception from ``handle`` (a sink hitting a closed pipe) or from the
+	provider is raised as itself after the listing has been cancelled.
+	"""
+	send, receive = anyio.create_memory_object_stream(_STREAM_BUFFER)
+	errors: List[Exception] = []
+
+	async def _produce() -> None:
+		async with send:
+			try:
+				await _listing(provider, target, send)
+			except Exception as exc:
+				errors.append(exc)
+
+	async with anyio.create_task_group() as tg:
+		tg.start_soon(_produce)
+		async with receive:
+			try:
+				async for record in receive:
+					handle(record)
+			except Exception as exc:
+				errors.insert(0, exc)
+				tg.cancel_scope.cancel()
+	if errors:
+		raise errors[0]
+
+
+async def _search_and_enrich(
+	provider: AntibodyProvider,
+	target: str,
+	criteria: Criteria,
+	limiter: anyio.CapacityLimiter,
+	emit: RecordSink,
+	top: Optional[TopK] = None,
+) -> None:
+	"""Enrich listing records with product details while the listing is still being fetched.
+
+	Records that fail the criteria the provider's ``listing_fields`` can already
+	decide are dropped without fetching their detail page, as are records that
+	could not reach ``top`` even if enrichment filled every missing field.
+	"""
+	listing_fields = getattr(provider, "listing_fields", ())
+	listing_criteria = restrict_criteria(criteria, listing_fields)
+
+	def _out_of_reach(record: AnyRecord) -> bool:
+		if top is None or top.can_enter(best_possible_key(record, listing_fields)):
+			return False
+		count(f"records.pruned.{provider.name}")
+		return True
+
+	async def _enrich(record: AnyRecord) -> None:
+		async with limiter:
+			# The top K may have filled up while this record waited for a slot
+			if _out_of_reach(record):
+				return
+			with span("enrich", provider=provider.name, catalog=record.catalog_number):
+				record = await provider.aenrich(record)
+			# Anything derived from the listing fields is stale now
+			invalidate(record)
+		emit(record)
+
+	async with anyio.create_task_group() as tg:
+		def _admit(record: AnyRecord) -> None:
+			if not record_matches_criteria(record, listing_criteria):
+				count(f"records.prefiltered.{provider.name}")
+			elif not _out_of_reach(record):
+				tg.start_soon(_enrich, record)
+
+		await _consume(provider, target, _admit)
+
+
+async def _run_provider(
+	provider: AntibodyProvider,
+	target: str,
+	timeout_seconds: Optional[float],
+	limiters: Sequence[anyio.CapacityLimiter],
+	sink: Optional[RecordSink] = None,
+	enrich_criteria: Optional[Criteria] = None,
+	detail_limiter: Optional[anyio.CapacityLimiter] = None,
+	top: Optional[TopK] = None,
+) -> Tuple[List[AnyRecord], str]:
+	"""Run one provider once every limiter admits it.
+
+	Returns the records and a status of ``ok``, ``timeout`` or ``error: ...``;
+	the timeout only counts time spent searching, not time spent queued. With a
+	``sink``, records are handed to it as the provider produces them and the
+	returned list stays empty; an exception from the sink is not a provider
+	error and propagates, cancelling the rest of the search. With ``enrich_criteria``, providers exposing
+	``aenrich`` have their surviving records completed from product pages,
+	``detail_limiter`` bounding the detail fetches in flight and ``top``
+	letting them skip records that cannot make the final cut.
+	"""
+	records: List[AnyRecord] = []
+	sink_errors: List[Exception] = []
+
+	def _deliver(record: AnyRecord) -> None:
+		try:
+			sink(record)
+		except Exception as exc:
+			sink_errors.append(exc)
+			raise
+
+	emit = _deliver if sink is not None else records.append
+	status = "timeout"
+	async with AsyncExitStack() as stack:
+		for limiter in limiters:
+			await stack.enter_async_context(limiter)
+		with span("provider", provider=provider.name, target=target) as sp:
+			with anyio.move_on_after(timeout_seconds):
+				try:
+					astream = getattr(provider, "astream", None)
+					asearch = getattr(provider, "asearch", None)
+					if enrich_criteria is not None and hasattr(provider, "aenrich"):
+						if detail_limiter is None:
+							detail_limiter = anyio.CapacityLimiter(DEFAULT_DETAIL_CONCURRENCY)
+						await _search_and_enrich(provider, target, enrich_criteria, detail_limiter, emit, top)
+					elif sink is not None and astream is not None:
+						await _consume(provider, target, emit)
+					elif asearch is not None:
+						for record in await asearch(target):
+							emit(record)
+					elif sink is not None:
+						await anyio.to_thread.run_sync(
+							lambda: _drain(provider.search(target), emit),
+							abandon_on_cancel=True,
+						)
+					else:
+						records = await anyio.to_thread.run_sync(
+							lambda: list(provider.search(target)),
+							abandon_on_cancel=True,
+						)
+					status = "ok"
+				except Exception as exc:
+					if sink_errors:
+						raise sink_errors[0] from None
+					exc = _first_error(exc)
+					status = f"error: {type(exc).__name__}: {exc}"
+			sp.set(status=status)
+	return records, status
+
+
+async def _search_target(
+	target: str,
+	providers: Sequence[AntibodyProvider],
+	timeout_seconds: Optional[float],
+	limiter: anyio.CapacityLimiter,
+	provider_limiters: Optional[Sequence[anyio.CapacityLimiter]] = None,
+	sink: Optional[RecordSink] = None,
+	enrich_criteria: Optional[Criteria] = None,
+	detail_limiters: Optional[Sequence[anyio.CapacityLimiter]] = None,
+	limit: Optional[int] = None,
+	criteria: Optional[Criteria] = None,
+) -> TargetResult:
+	slots: List[List[AnyRecord]] = [[] for _ in providers]
+	statuses: List[str] = ["" for _ in providers]
+	top: Optional[TopK] = None
+	if limit is not None and sink is None:
+		# Records go straight into a bounded heap shared by all providers of this target
+		top = TopK(limit)
+		wanted = criteria or Criteria()
+
+		def sink(record: AnyRecord) -> None:
+			if record_matches_criteria(record, wanted):
+				top.push(record)
+
+	async def _collect(index: int, provider: AntibodyProvider) -> None:
+		limiters = [limiter] if provider_limiters is None else [provider_limiters[index], limiter]
+		slots[index], statuses[index] = await _run_provider(
+			provider,
+			target,
+			timeout_seconds,
+			limiters,
+			sink,
+			enrich_criteria,
+			detail_limiters[index] if detail_limiters is not None else None,
+			top,
+		)
+
+	try:
+		async with anyio.create_task_group() as tg:
+			for i, provider in enumerate(providers):
+				tg.start_soon(_collect, i, provider)
+	except Exception as exc:
+		# Only a failing sink gets here; raise it as itself rather than in a group
+		raise _first_error(exc) from None
+
+	records: List[AnyRecord] = []
+	for provider_records in slots:
+		records.extend(provider_records)
+	if top is not None:
+		records = top.records()
+	return TargetResult(
+		target=target,
+		records=records,
+		provider_status={p.name: st for p, st in zip(providers, statuses)},
+	)
+
+
+async def search_all(
+	target: str,
+	providers: Sequence[AntibodyProvider] | None = None,
+	timeout_seconds: Optional[float] = DEFAULT_PROVIDER_TIMEOUT,
+	max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+	on_record: Optional[RecordSink] = None,
+	enrich: bool = False,
+	criteria: Optional[Criteria] = None,
+	detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+	limit: Optional[int] = None,
+) -> List[AnyRecord]:
+	"""Query all providers concurrently and return their records in provider order.
+
+	Providers exposing an ``asearch`` coroutine run on the event loop; plain
+	``search`` implementations run on worker threads. Each provider gets its
+	own timeout, so total latency tracks the slowest provider.
+
+	With ``on_record`` the records are streamed to the callback as providers
+	yield them (preferring a provider's ``astream``) and the returned list is empty.
+
+	With ``enrich``, providers exposing ``aenrich`` fetch product detail pages
+	for records that pass the listing-decidable part of ``criteria``, at most
+	``detail_concurrency`` per provider at a time.
+
+	With ``limit`` (and no ``on_record``) only the ``limit`` best records
+	matching ``criteria`` are kept, best first, in a heap filled as providers
+	yield; enrichment is skipped for records that can no longer get in.
+	"""
+	if providers is None or len(providers) == 0:
+		providers = _default_providers()
+
+	limiter = anyio.CapacityLimiter(max(1, max_concurrency))
+	result = await _search_target(
+		target,
+		providers,
+		timeout_seconds,
+		limiter,
+		sink=on_record,
+		enrich_criteria=(criteria or Criteria()) if enrich else None,
+		detail_limiters=[anyio.CapacityLimiter(max(1, detail_concurrency)) for _ in providers],
+		limit=limit,
+		criteria=criteria,
+	)
+	return result.records
+
+
+async def search_many(
+	targets: Sequence[str],
+	providers: Sequence[AntibodyProvider] | None = None,
+	timeout_seconds: Optional[float] = DEFAULT_PROVIDER_TIMEOUT,
+	max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+	per_provider_concurrency: int = DEFAULT_PER_PROVIDER_CONCURRENCY,
+	on_record: Optional[RecordSink] = None,
+	enrich: bool = False,
+	criteria: Optional[Criteria] = None,
+	detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+	limit: Optional[int] = None,
+) -> Dict[str, TargetResult]:
+	"""Search many targets with the same provider instances, keyed by target.
+
+	``max_concurrency`` caps provider queries in flight across all targets and
+	``per_provider_concurrency`` caps them per provider, so one shared client
+	and browser pool per provider serve the whole batch. ``on_record`` streams
+	records as in ``search_all``, leaving each result's records empty, and
+	``enrich`` works as in ``search_all`` with the detail limit shared by all
+	targets. ``limit`` keeps the best records per target as in ``search_all``.
+	"""
 	if providers is None or len(providers) == 0:
-		providers = [AbcamProvider()]
+		providers = _default_providers()
 
-	results: List[AntibodyRecord] = []
+	limiter = anyio.CapacityLimiter(max(1, max_concurrency))
+	provider_limiters = [anyio.CapacityLimiter(max(1, per_provider_concurrency)) for _ in providers]
+	detail_limiters = [anyio.CapacityLimiter(max(1, detail_concurrency)) for _ in providers]
+	enrich_criteria = (criteria or Criteria()) if enrich else None
+	results: Dict[str, TargetResult] = {}
+
+	async def _collect(target: str) -> None:
+		results[target] = await _search_target(
+			target,
+			providers,
+			timeout_seconds,
+			limiter,
+			provider_limiters,
+			on_record,
+			enrich_criteria,
+			detail_limiters,
+			limit,
+			criteria,
+		)
+
+	unique_targets = list(dict.fromkeys(targets))
+	try:
+		async with anyio.create_task_group() as tg:
+			for target in unique_targets:
+				tg.start_soon(_collect, target)
+	except Exception as exc:
+		# A failing ``on_record`` cancels every target; raise it as itself rather than in a group
+		raise _first_error(exc) from None
+
+	return {target: results[target] for target in unique_targets}
+
+
+async def aclose_providers(providers: Sequence[AntibodyProvider]) -> None:
+	"""Release event-loop-bound resources (async clients, browser pools) held by providers."""
 	for provider in providers:
-		results.extend(list(provider.search(target)))
-	return results
+		aclose = getattr(provider, "aclose", None)
+		if aclose is not None:
+			await aclose()
+
+
+def search_all_sync(
+	target: str,
+	providers: Sequence[AntibodyProvider] | None = None,
+	timeout_seconds: Optional[float] = DEFAULT_PROVIDER_TIMEOUT,
+	max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+	on_record: Optional[RecordSink] = None,
+	enrich: bool = False,
+	criteria: Optional[Criteria] = None,
+	detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+	limit: Optional[int] = None,
+) -> List[AnyRecord]:
+	if providers is None or len(providers) == 0:
+		providers = _default_providers()
+
+	async def _run() -> List[AnyRecord]:
+		try:
+			return await search_all(
+				target,
+				providers,
+				timeout_seconds=timeout_seconds,
+				max_concurrency=max_concurrency,
+				on_record=on_record,
+				enrich=enrich,
+				criteria=criteria,
+				detail_concurrency=detail_concurrency,
+				limit=limit,
+			)
+		finally:
+			await aclose_providers(providers)
+
+	return anyio.run(_run)
+
+
+def search_many_sync(
+	targets: Sequence[str],
+	providers: Sequence[AntibodyProvider] | None = None,
+	timeout_seconds: Optional[float] = DEFAULT_PROVIDER_TIMEOUT,
+	max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+	per_provider_concurrency: int = DEFAULT_PER_PROVIDER_CONCURRENCY,
+	on_record: Optional[RecordSink] = None,
+	enrich: bool = False,
+	criteria: Optional[Criteria] = None,
+	detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+	limit: Optional[int] = None,
+) -> Dict[str, TargetResult]:
+	if providers is None or len(providers) == 0:
+		providers = _default_providers()
+
+	async def _run() -> Dict[str, TargetResult]:
+		try:
+			return await search_many(
+				targets,
+				providers,
+				timeout_seconds=timeout_seconds,
+				max_concurrency=max_concurrency,
+				per_provider_concurrency=per_provider_concurrency,
+				on_record=on_record,
+				enrich=enrich,
+				criteria=criteria,
+				detail_concurrency=detail_concurrency,
+				limit=limit,
+			)
+		finally:
+			await aclose_providers(providers)
+
+	return anyio.run(_run)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional, Tuple
 
-from .models import AntibodyRecord, PackageOption
+from .models import AnyRecord, PackageOption
 
 
 def _amount_ug_from(concentration_mg_per_ml: Optional[float], volume_ul: Optional[float], fallback_amount_ug: Optional[float]) -> Optional[float]:
@@ -14,7 +14,7 @@ def _amount_ug_from(concentration_mg_per_ml: Optional[float], volume_ul: Optiona
 	return None
 
 
-def pick_best_package(record: AntibodyRecord, min_amount_ug: float = 10.0) -> Optional[Tuple[float, float, Optional[str], Optional[str]]]:
+def pick_best_package(record: AnyRecord, min_amount_ug: float = 10.0) -> Optional[Tuple[float, float, Optional[str], Optional[str]]]:
 	"""Return (amount_ug, price, currency, label) for the smallest package meeting the minimum.
 	Falls back to the record-level fields when no package options are present.
 	"""
@@ -0,0 +1,310 @@
+"""Long-running search server keeping providers, connection pools and caches warm.
+
+	python -m absearch.server                 # Unix socket at ~/.cache/absearch/server.sock
+	python -m absearch.server --port 8765     # or TCP on 127.0.0.1
+
+The CLI forwards live searches to a running server automatically (see
+``absearch.client``). Endpoints: ``GET /health`` and ``POST /search`` with
+``{"targets": [...], "criteria": {...}, "providers": [...], "enrich": true, "limit": null}``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import anyio.from_thread
+import typer
+from pydantic import ValidationError
+
+from .cache import ResponseCache, SQLiteResponseCache, default_cache_dir
+from .endpoints import EndpointMemory
+from .filters import filter_records
+from .models import Criteria, promote
+from .ordering import sort_records_by_priority
+from .parsing import ParseExecutor, default_parse_workers
+from .providers import AntibodyProvider
+from .providers.base import DEFAULT_MAX_PAGES
+from .search import (
+	DEFAULT_DETAIL_CONCURRENCY,
+	DEFAULT_MAX_CONCURRENCY,
+	DEFAULT_PER_PROVIDER_CONCURRENCY,
+	DEFAULT_PROVIDER_TIMEOUT,
+	aclose_providers,
+	get_providers,
+	search_many,
+)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_RESULT_TTL = 300.0
+DEFAULT_MAX_RESULTS = 1024
+
+
+def default_socket_path() -> Path:
+	return default_cache_dir() / "server.sock"
+
+
+class SearchService:
+	"""Runs searches on one long-lived event loop so providers keep their clients warm.
+
+	Provider instances are created per spec (``abcam``, ``abcam:headless``) on
+	first use and reused for every later request; ranked results are kept in
+	memory for ``result_ttl`` seconds, at most ``max_results`` of them, dropping
+	the least recently used first.
+	"""
+
+	def __init__(
+		self,
+		portal: anyio.from_thread.BlockingPortal,
+		cache: Optional[ResponseCache] = None,
+		result_ttl: float = DEFAULT_RESULT_TTL,
+		max_results: int = DEFAULT_MAX_RESULTS,
+		timeout_seconds: float = DEFAULT_PROVIDER_TIMEOUT,
+		max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+		per_provider_concurrency: int = DEFAULT_PER_PROVIDER_CONCURRENCY,
+		detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+		parser: Optional[ParseExecutor] = None,
+		endpoints: Optional[EndpointMemory] = None,
+		max_pages: Optional[int] = None,
+	) -> None:
+		self._portal = portal
+		self._cache = cache
+		self._parser = parser
+		self._endpoints = endpoints
+		self._max_pages = max_pages
+		self._result_ttl = result_ttl
+		self._max_results = max(1, max_results)
+		self._timeout_seconds = timeout_seconds
+		self._max_concurrency = max_concurrency
+		self._per_provider_concurrency = per_provider_concurrency
+		self._detail_concurrency = detail_concurrency
+		self._lock = threading.Lock()
+		self._providers: Dict[str, AntibodyProvider] = {}
+		self._results: OrderedDict[str, Tuple[float, Dict[str, object]]] = OrderedDict()
+
+	def _get_providers(self, specs: List[str]) -> List[AntibodyProvider]:
+		"""Shared provider instances for ``specs``; unknown names are skipped, as in ``get_providers``."""
+		providers: List[AntibodyProvider] = []
+		with self._lock:
+			for spec in specs:
+				key = spec.lower()
+				if key not in self._providers:
+					built = get_providers([spec], cache=self._cache, parser=self._parser, endpoints=self._endpoints, max_pages=self._max_pages)
+					if not built:
+						continue
+					self._providers[key] = built[0]
+				providers.append(self._providers[key])
+		return providers
+
+	def _cached(self, key: str) -> Optional[Dict[str, object]]:
+		with self._lock:
+			entry = self._results.get(key)
+			if entry is None or entry[0] < time.monotonic():
+				self._results.pop(key, None)
+				return None
+			self._results.move_to_end(key)
+			return entry[1]
+
+	def _remember(self, key: str, payload: Dict[str, object]) -> None:
+		now = time.monotonic()
+		with self._lock:
+			self._results[key] = (now + self._result_ttl, payload)
+			self._results.move_to_end(key)
+			if len(self._results) <= self._max_results:
+				return
+			for stale in [k for k, (expires, _) in self._results.items() if expires < now]:
+				del self._results[stale]
+			while len(self._results) > self._max_results:
+				self._results.popitem(last=False)
+
+	def _result_key(self, target: str, specs: List[str], criteria: Criteria, enrich: bool, limit: Optional[int]) -> str:
+		return json.dumps([target, specs, criteria.model_dump(mode="json"), enrich, limit], sort_keys=True)
+
+	def _search_targets(self, targets: List[str], specs: List[str], criteria: Criteria, enrich: bool, limit: Optional[int]) -> Dict[str, Dict[str, object]]:
+		"""Ranked payloads per target; targets not cached are searched together in one ``search_many``."""
+		payloads: Dict[str, Dict[str, object]] = {}
+		missing: List[str] = []
+		for target in targets:
+			cached = self._cached(self._result_key(target, specs, criteria, enrich, limit))
+			if cached is not None:
+				payloads[target] = cached
+			else:
+				missing.append(target)
+
+		if missing:
+			providers = self._get_providers(specs)
+			results = self._portal.call(lambda: search_many(
+				missing,
+				providers,
+				timeout_seconds=self._timeout_seconds,
+				max_concurrency=self._max_concurrency,
+				per_provider_concurrency=self._per_provider_concurrency,
+				enrich=enrich,
+				criteria=criteria,
+				detail_concurrency=self._detail_concurrency,
+				limit=limit,
+			))
+			for target in missing:
+				result = results[target]
+				# search_many already returns the top ``limit`` matches in rank order
+				ranked = result.records if limit is not None else sort_records_by_priority(filter_records(result.records, criteria))
+				payloads[target] = payload = {
+					"status": result.status,
+					"provider_status": result.provider_status,
+					"records": [promote(r).model_dump(mode="json") for r in ranked],
+				}
+				# Failed lookups are retried on the next request rather than cached
+				if result.status == "ok":
+					self._remember(self._result_key(target, specs, criteria, enrich, limit), payload)
+		return {target: payloads[target] for target in targets}
+
+	def search(self, request: Dict[str, object]) -> Dict[str, object]:
+		targets = list(dict.fromkeys(str(t) for t in request.get("targets") or []))
+		specs = [str(p) for p in request.get("providers") or ["abcam"]]
+		criteria = Criteria.model_validate(request.get("criteria") or {})
+		enrich = bool(request.get("enrich", True))
+		limit = int(request["limit"]) if request.get("limit") is not None else None
+		return {"results": self._search_targets(targets, specs, criteria, enrich, limit)}
+
+	def health(self) -> Dict[str, object]:
+		with self._lock:
+			return {"status": "ok", "pid": os.getpid(), "providers": sorted(self._providers), "cached_results": len(self._results)}
+
+	def close(self) -> None:
+		with self._lock:
+			providers = list(self._providers.values())
+			self._providers.clear()
+		self._portal.call(aclose_providers, providers)
+
+
+class _Handler(BaseHTTPRequestHandler):
+	server_version = "absearch"
+	protocol_version = "HTTP/1.1"
+
+	def address_string(self) -> str:
+		# Unix socket peers have no (host, port) address
+		return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+	def log_message(self, format: str, *args) -> None:
+		if self.server.verbose:
+			super().log_message(format, *args)
+
+	def _send_json(self, status: int, payload: Dict[str, object]) -> None:
+		body = json.dumps(payload).encode()
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def do_GET(self) -> None:
+		if self.path == "/health":
+			self._send_json(200, self.server.service.health())
+		else:
+			self._send_json(404, {"error": f"no route {self.path}"})
+
+	def do_POST(self) -> None:
+		if self.path != "/search":
+			self._send_json(404, {"error": f"no route {self.path}"})
+			return
+		try:
+			length = int(self.headers.get("Content-Length") or 0)
+			request = json.loads(self.rfile.read(length) or b"{}")
+			self._send_json(200, self.server.service.search(request))
+		except (ValueError, ValidationError, KeyError) as exc:
+			self._send_json(400, {"error": f"{type(exc).__name__}: {exc}"})
+		except Exception as exc:
+			self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+
+class _TCPServer(ThreadingHTTPServer):
+	daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+	daemon_threads = True
+
+
+def _bind(socket_path: Optional[str], host: str, port: Optional[int]) -> socketserver.BaseServer:
+	if port is not None or not hasattr(socket, "AF_UNIX"):
+		return _TCPServer((host, port or 8765), _Handler)
+	path = Path(socket_path) if socket_path else default_socket_path()
+	path.parent.mkdir(parents=True, exist_ok=True)
+	if path.exists():
+		# A socket left behind by a server that died; a live one would accept
+		probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		try:
+			probe.connect(str(path))
+		except OSError:
+			path.unlink()
+		else:
+			raise typer.BadParameter(f"A server is already listening on {path}")
+		finally:
+			probe.close()
+	return _UnixServer(str(path), _Handler)
+
+
+def main(
+	socket_path: Optional[str] = typer.Option(None, "--socket", help=f"Unix socket to listen on (default: {default_socket_path()})"),
+	host: str = typer.Option(DEFAULT_HOST, "--host", help="TCP host, used with --port"),
+	port: Optional[int] = typer.Option(None, "--port", help="Listen on TCP instead of a Unix socket"),
+	providers: Optional[List[str]] = typer.Option(None, "--providers", help="Providers to warm up at start (others are created on first request)"),
+	cache_dir: Optional[str] = typer.Option(None, "--cache-dir", help=f"Directory for the HTTP response cache (default: {default_cache_dir()})"),
+	no_cache: bool = typer.Option(False, "--no-cache", help="Disable the HTTP response cache"),
+	result_ttl: float = typer.Option(DEFAULT_RESULT_TTL, "--result-ttl", help="Seconds to reuse ranked results for an identical request"),
+	max_results: int = typer.Option(DEFAULT_MAX_RESULTS, "--max-results", min=1, help="Ranked results kept in memory; the least recently used are dropped first"),
+	timeout: float = typer.Option(DEFAULT_PROVIDER_TIMEOUT, "--timeout", help="Per-provider timeout in seconds"),
+	max_concurrency: int = typer.Option(DEFAULT_MAX_CONCURRENCY, "--max-concurrency", help="Maximum number of provider queries in flight at once"),
+	per_provider_concurrency: int = typer.Option(DEFAULT_PER_PROVIDER_CONCURRENCY, "--per-provider-concurrency", help="Maximum concurrent queries per provider"),
+	detail_concurrency: int = typer.Option(DEFAULT_DETAIL_CONCURRENCY, "--detail-concurrency", help="Maximum product pages fetched at once per provider"),
+	parse_workers: int = typer.Option(default_parse_workers(), "--parse-workers", min=0, help="Processes parsing large pages in parallel; 0 parses on a thread"),
+	max_pages: int = typer.Option(DEFAULT_MAX_PAGES, "--max-pages", min=1, help="Listing pages to follow per search URL"),
+	verbose: bool = typer.Option(False, "--verbose", help="Log every request to stderr"),
+):
+	"""Serve searches from one warm process over a local socket."""
+	cache = None if no_cache else SQLiteResponseCache(cache_dir)
+	server = _bind(socket_path, host, port)
+	with anyio.from_thread.start_blocking_portal() as portal:
+		service = SearchService(
+			portal,
+			cache=cache,
+			result_ttl=result_ttl,
+			max_results=max_results,
+			timeout_seconds=timeout,
+			max_concurrency=max_concurrency,
+			per_provider_concurrency=per_provider_concurrency,
+			detail_concurrency=detail_concurrency,
+			parser=ParseExecutor(parse_workers),
+			endpoints=None if no_cache else EndpointMemory(cache_dir or default_cache_dir()),
+			max_pages=max_pages,
+		)
+		service._get_providers(providers or ["abcam"])
+		server.service = service
+		server.verbose = verbose
+		address = server.server_address
+		where = f"unix:{address}" if isinstance(address, str) else f"http://{address[0]}:{address[1]}"
+		typer.echo(f"absearch server listening on {where} (set ABSEARCH_SERVER={where} if not the default)", err=True)
+		# shutdown() blocks until serve_forever returns, so it cannot run on this thread
+		signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+		try:
+			server.serve_forever()
+		except KeyboardInterrupt:
+			pass
+		finally:
+			server.server_close()
+			if isinstance(address, str):
+				Path(address).unlink(missing_ok=True)
+			service.close()
+
+
+if __name__ == "__main__":
+	typer.run(main)
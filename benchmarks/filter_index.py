@@ -0,0 +1,93 @@
+"""Compare filter_records with FilterIndex on a synthetic result set.
+
+Run from the repository root:
+
+	python -m benchmarks.filter_index --records 100000 --criteria 50
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List
+
+from absearch.filters import FilterIndex, filter_records
+from absearch.models import AntibodyRecord, Criteria
+
+
+_SPECIES = ["Human", "Mouse", "Rat", "Monkey", "Dog", "Pig"]
+_HOSTS = ["Rabbit", "Mouse", "Goat", "Rat"]
+_APPS = ["WB", "IHC", "ICC", "IF", "FC", "ICFC", "IP", "ELISA"]
+_CONJ = ["HRP", "Alexa488", "FITC", "PE"]
+
+
+def synthetic_records(count: int, seed: int = 0) -> List[AntibodyRecord]:
+	rnd = random.Random(seed)
+	records: List[AntibodyRecord] = []
+	for i in range(count):
+		records.append(AntibodyRecord(
+			vendor=rnd.choice(["Abcam", "MockVendor"]),
+			catalog_number=f"ab{i}",
+			name=f"Synthetic antibody {i}",
+			target="TP53",
+			host_species=rnd.choice(_HOSTS),
+			clonality=rnd.choice(["Monoclonal", "Polyclonal", None]),
+			applications=rnd.sample(_APPS, rnd.randint(1, 4)),
+			validated_reactivity=rnd.sample(_SPECIES, rnd.randint(1, 3)),
+			conjugation=rnd.choice(_CONJ + [None] * 4),
+			price=rnd.choice([None, round(rnd.uniform(150, 700), 2)]),
+			citations_count=rnd.choice([None, rnd.randint(0, 300)]),
+			amount_ug=rnd.choice([None, rnd.choice([5, 10, 25, 50, 100])]),
+			concentration_mg_per_ml=rnd.choice([None, 0.5, 1.0]),
+			volume_ul=rnd.choice([None, 10, 50, 100]),
+		))
+	return records
+
+
+def synthetic_criteria(count: int, seed: int = 1) -> List[Criteria]:
+	rnd = random.Random(seed)
+	criteria: List[Criteria] = []
+	for _ in range(count):
+		criteria.append(Criteria(
+			species_reactivity=rnd.choice([None, rnd.sample(_SPECIES, 2)]),
+			host_species=rnd.choice([None, rnd.sample(_HOSTS, 1)]),
+			clonality=rnd.choice([None, ["monoclonal"]]),
+			applications=rnd.choice([None, rnd.sample(_APPS, rnd.randint(1, 2))]),
+			conjugation=rnd.choice([None, None, rnd.sample(_CONJ, 1)]),
+			min_citations=rnd.choice([None, 10, 50]),
+			max_price=rnd.choice([None, 400.0, 600.0]),
+			min_amount_ug=rnd.choice([None, 10.0, 25.0]),
+		))
+	return criteria
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--records", type=int, default=100_000)
+	parser.add_argument("--criteria", type=int, default=50)
+	args = parser.parse_args()
+
+	records = synthetic_records(args.records)
+	criteria = synthetic_criteria(args.criteria)
+
+	start = time.perf_counter()
+	expected = [filter_records(records, c) for c in criteria]
+	baseline = time.perf_counter() - start
+
+	start = time.perf_counter()
+	index = FilterIndex(records)
+	build = time.perf_counter() - start
+	start = time.perf_counter()
+	actual = [index.filter(c) for c in criteria]
+	query = time.perf_counter() - start
+
+	if actual != expected:
+		raise SystemExit("FilterIndex results differ from filter_records")
+	print(f"records={args.records} criteria={args.criteria}")
+	print(f"filter_records:   {baseline:.3f}s")
+	print(f"FilterIndex:      {build:.3f}s build + {query:.3f}s query")
+	print(f"speedup:          {baseline / (build + query):.1f}x overall, {baseline / query:.1f}x per query")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,68 @@
+"""Compare building validated AntibodyRecords with RecordDraft construction.
+
+Run from the repository root:
+
+	python -m benchmarks.record_construction --records 50000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from absearch.models import AntibodyRecord, RecordDraft
+
+
+def _fields(i: int) -> Dict[str, object]:
+	return dict(
+		vendor="Abcam",
+		catalog_number=f"ab{100000 + i}",
+		name=f"Anti-p53 antibody [EPR{i}] | ab{100000 + i}",
+		target="TP53",
+		url=f"https://www.abcam.com/products/primary-antibodies/anti-p53-antibody-ab{100000 + i}",
+		validated_reactivity=["Human", "Mouse"],
+		clonality="Monoclonal",
+		clone=f"EPR{i}",
+		applications=["WB", "IHC", "ICC"],
+		formulation="pbs, 0.02% sodium azide",
+		is_bsa_free=True,
+	)
+
+
+def _measure(factory: Callable[..., object], count: int) -> Dict[str, float]:
+	inputs = [_fields(i) for i in range(count)]
+	gc.collect()
+	start = time.perf_counter()
+	built = [factory(**kwargs) for kwargs in inputs]
+	elapsed = time.perf_counter() - start
+	del built
+
+	gc.collect()
+	tracemalloc.start()
+	built = [factory(**kwargs) for kwargs in inputs]
+	current, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	del built
+	return {"seconds": elapsed, "us_per_record": elapsed / count * 1e6, "bytes_per_record": current / count}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--records", type=int, default=50_000)
+	args = parser.parse_args()
+
+	rows: List[tuple[str, Dict[str, float]]] = [
+		("AntibodyRecord", _measure(AntibodyRecord, args.records)),
+		("RecordDraft", _measure(RecordDraft, args.records)),
+	]
+	print(f"records={args.records}")
+	for label, stats in rows:
+		print(f"{label:<15} {stats['us_per_record']:8.2f} us/record  {stats['bytes_per_record']:8.0f} B/record")
+	(full, slim) = (rows[0][1], rows[1][1])
+	print(f"construction {full['seconds'] / slim['seconds']:.1f}x faster, {full['bytes_per_record'] / slim['bytes_per_record']:.1f}x less memory")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,220 @@
+"""Time the parse, normalize, derive, filter, sort, package and render stages separately.
+
+Everything runs offline on synthetic listing HTML and records. Run from the
+repository root and keep the JSON to compare later commits against it:
+
+	python -m benchmarks.stages --sizes 1000 10000 50000 --output before.json
+	python -m benchmarks.stages --sizes 1000 10000 50000 --compare before.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from rich.console import Console
+
+from absearch import cli
+from absearch.filters import filter_records
+from absearch.models import AntibodyRecord, Criteria, PackageOption
+from absearch.ordering import _codes_for_text, derived, invalidate, normalize_applications, sort_records_by_priority, top_k_by_priority
+from absearch.providers.abcam import AbcamProvider
+from absearch.selection import pick_best_package
+
+from .filter_index import synthetic_records
+
+
+_STAGES = ["parse_listings", "normalize_applications", "derive_fields", "filter_records", "sort_records_by_priority", "top_k_by_priority", "pick_best_package", "render_table"]
+
+_SPECIES = ["Human", "Mouse", "Rat", "Monkey", "Zebrafish", "Dog"]
+_RAW_APPS = [
+	"Western blot", "WB", "IHC-P", "IHC-Fr", "Immunohistochemistry", "ICC/IF", "Immunocytochemistry",
+	"Flow Cyt (Intra)", "Flow cytometry, intracellular", "Flow Cytometry", "FACS", "IP", "ELISA",
+	"Sandwich ELISA", "ChIP-seq", "Dot blot", "Immunofluorescence",
+]
+_FORMULATIONS = [
+	"PBS, 0.02% sodium azide", "BSA-free, PBS", "Tris-glycine with 0.1% BSA", "PBS with gelatin",
+	"Carrier free, ascites-free PBS", "50% glycerol, 0.05% BSA",
+]
+
+
+def _card(rnd: random.Random, i: int) -> str:
+	catalog = f"ab{100000 + i}"
+	clonality = rnd.choice(["Rabbit monoclonal", "Mouse monoclonal", "Rabbit polyclonal", "Goat polyclonal"])
+	clone = f" [EPR{rnd.randint(1000, 99999)}]" if "mono" in clonality else ""
+	apps = "".join(f'<li class="chip">{a}</li>' for a in rnd.sample(_RAW_APPS, rnd.randint(1, 5)))
+	species = ", ".join(rnd.sample(_SPECIES, rnd.randint(1, 3)))
+	return (
+		f'<li class="result"><div class="card"><div class="card-header">'
+		f'<a class="title" href="/products/primary-antibodies/anti-p53-antibody{clone.lower().replace(" ", "-")}-{catalog}">'
+		f'<span>Anti-p53 antibody{clone}</span> <span class="code">{catalog}</span></a></div>'
+		f'<div class="card-body"><div class="row"><span class="label">Host</span><span>{clonality}</span></div>'
+		f'<div class="row"><span class="label">Reactivity</span><span>{species}</span></div>'
+		f'<div class="row"><span class="label">Applications</span><ul class="chips">{apps}</ul></div>'
+		f'<div class="row"><span class="label">Formulation</span><span>{rnd.choice(_FORMULATIONS)}</span></div>'
+		f'</div><div class="card-footer"><a class="btn" href="#compare">Compare</a></div></div></li>'
+	)
+
+
+def synthetic_listing_html(cards: int, seed: int = 0) -> str:
+	"""A listing page shaped like a vendor search result, with site chrome around the cards."""
+	rnd = random.Random(seed)
+	nav = "".join(f'<li><a href="/{section}">{section.title()}</a></li>' for section in ["products", "support", "about", "contact"])
+	facets = "".join(f'<label><input type="checkbox"> {s}</label>' for s in _SPECIES + _RAW_APPS)
+	body = "".join(_card(rnd, i) for i in range(cards))
+	return (
+		f"<html><head><title>Primary antibodies</title></head><body>"
+		f'<header><nav><ul>{nav}</ul></nav></header><main><div class="layout">'
+		f'<aside class="filters"><form>{facets}</form></aside>'
+		f'<section class="results"><div class="results-inner"><ul class="result-list">{body}</ul></div></section>'
+		f'</div></main><footer><a href="/terms">Terms</a></footer></body></html>'
+	)
+
+
+def synthetic_antibody_records(count: int, seed: int = 0) -> List[AntibodyRecord]:
+	"""Records as ``filter_index.synthetic_records``, plus raw application names and package options."""
+	rnd = random.Random(seed)
+	records = synthetic_records(count, seed)
+	for record in records:
+		record.applications = rnd.sample(_RAW_APPS, rnd.randint(1, 5))
+		record.formulation = rnd.choice(_FORMULATIONS)
+		record.package_options = [
+			PackageOption(
+				label=f"{size} µg",
+				amount_ug=float(size),
+				price=round(rnd.uniform(150, 900), 2),
+				currency="USD",
+			)
+			for size in sorted(rnd.sample([5, 10, 25, 50, 100, 500], rnd.randint(0, 3)))
+		]
+	return records
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> List[float]:
+	timings: List[float] = []
+	for _ in range(repeat):
+		if setup is not None:
+			setup()
+		gc.collect()
+		start = time.perf_counter()
+		fn()
+		timings.append(time.perf_counter() - start)
+	return timings
+
+
+def _render(records: List[AntibodyRecord]) -> None:
+	previous = cli.console
+	cli.console = Console(file=io.StringIO(), width=250)
+	try:
+		cli._render_table(records)
+	finally:
+		cli.console = previous
+
+
+def run_stages(size: int, repeat: int, stages: List[str], render_max: int) -> List[Dict[str, object]]:
+	provider = AbcamProvider()
+	html = synthetic_listing_html(size)
+	records = synthetic_antibody_records(size)
+	# Rich tables cost milliseconds per row, so rendering is timed on a prefix
+	rendered = records[:render_max]
+	criteria = Criteria(species_reactivity=["Human"], applications=["WB"], min_amount_ug=10.0)
+	benches: Dict[str, Callable[[], List[float]]] = {
+		"parse_listings": lambda: _time(lambda: provider._parse_listings(html, "TP53"), repeat),
+		# The normalizer memoizes per string, so every run starts from a cold cache
+		"normalize_applications": lambda: _time(
+			lambda: [normalize_applications(r.applications) for r in records],
+			repeat,
+			setup=_codes_for_text.cache_clear,
+		),
+		# Cold derivation; later stages read the cached values, as the pipeline does
+		"derive_fields": lambda: _time(
+			lambda: [derived(r) for r in records],
+			repeat,
+			setup=lambda: [invalidate(r) for r in records] and _codes_for_text.cache_clear(),
+		),
+		"filter_records": lambda: _time(lambda: filter_records(records, criteria), repeat),
+		"sort_records_by_priority": lambda: _time(lambda: sort_records_by_priority(records), repeat),
+		"top_k_by_priority": lambda: _time(lambda: top_k_by_priority(records, 20), repeat),
+		"pick_best_package": lambda: _time(lambda: [pick_best_package(r) for r in records], repeat),
+		"render_table": lambda: _time(lambda: _render(rendered), repeat),
+	}
+
+	results: List[Dict[str, object]] = []
+	for stage in stages:
+		timings = benches[stage]()
+		best = min(timings)
+		items = len(rendered) if stage == "render_table" else size
+		results.append({
+			"stage": stage,
+			"size": size,
+			"items": items,
+			"repeat": repeat,
+			"best_s": best,
+			"mean_s": sum(timings) / len(timings),
+			"us_per_item": best / items * 1e6,
+		})
+		print(f"{stage:<26} n={items:<7} best {best:8.4f}s  {best / items * 1e6:8.2f} us/item", file=sys.stderr)
+	return results
+
+
+def _git_commit() -> Optional[str]:
+	try:
+		out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+	return out.stdout.strip() or None
+
+
+def _compare(results: List[Dict[str, object]], baseline_path: str) -> None:
+	with open(baseline_path) as fh:
+		baseline = {(r["stage"], r["size"]): r["us_per_item"] for r in json.load(fh)["results"]}
+	print(f"\nvs {baseline_path} (ratio > 1 is slower):", file=sys.stderr)
+	for r in results:
+		before = baseline.get((r["stage"], r["size"]))
+		if before:
+			print(f"{r['stage']:<26} n={r['size']:<7} {r['us_per_item'] / before:6.2f}x", file=sys.stderr)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+	parser.add_argument("--repeat", type=int, default=3)
+	parser.add_argument("--stages", nargs="+", choices=_STAGES, default=_STAGES)
+	parser.add_argument("--render-max", type=int, default=2000, help="Render at most this many rows per size")
+	parser.add_argument("--output", help="Write JSON results here instead of stdout")
+	parser.add_argument("--compare", help="Earlier JSON results to print ratios against")
+	args = parser.parse_args()
+
+	results: List[Dict[str, object]] = []
+	for size in args.sizes:
+		results.extend(run_stages(size, args.repeat, args.stages, args.render_max))
+
+	report = {
+		"meta": {
+			"commit": _git_commit(),
+			"python": platform.python_version(),
+			"platform": platform.platform(),
+			"created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+		},
+		"results": results,
+	}
+	if args.output:
+		with open(args.output, "w") as fh:
+			json.dump(report, fh, indent=2)
+	else:
+		json.dump(report, sys.stdout, indent=2)
+		print()
+	if args.compare:
+		_compare(results, args.compare)
+
+
+if __name__ == "__main__":
+	main()
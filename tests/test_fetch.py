@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+import anyio
+import httpx
+import pytest
+
+from absearch.fetch import CircuitOpenError, FetchError, Fetcher
+
+
+Reply = Tuple[int, Dict[str, str]]
+
+
+class _Handler(BaseHTTPRequestHandler):
+	"""Answers each path from its script of replies, repeating the last one once the script runs out."""
+
+	scripts: Dict[str, List[Reply]] = {}
+	hits: Dict[str, int] = {}
+
+	def do_GET(self) -> None:
+		script = self.scripts.get(self.path, [(404, {})])
+		count = self.hits.get(self.path, 0)
+		self.hits[self.path] = count + 1
+		status, headers = script[min(count, len(script) - 1)]
+		body = b"ok" if status == 200 else b""
+		self.send_response(status)
+		for name, value in headers.items():
+			self.send_header(name, value)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, format: str, *args: object) -> None:
+		pass
+
+
+@pytest.fixture
+def server():
+	_Handler.scripts = {}
+	_Handler.hits = {}
+	httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+	thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+	thread.start()
+	try:
+		yield f"http://127.0.0.1:{httpd.server_address[1]}", _Handler
+	finally:
+		httpd.shutdown()
+		httpd.server_close()
+
+
+def _fetcher(**kwargs: object) -> Fetcher:
+	options = dict(rate=100, burst=100, max_rate=100, backoff=0.01, max_backoff=0.05)
+	options.update(kwargs)
+	return Fetcher(**options)
+
+
+def _host_metrics(fetcher: Fetcher) -> Dict[str, object]:
+	(metrics,) = fetcher.metrics().values()
+	return metrics
+
+
+@pytest.mark.anyio
+async def test_429_waits_for_retry_after_and_halves_rate(server):
+	base, handler = server
+	handler.scripts["/throttled"] = [(429, {"Retry-After": "0.4"}), (200, {})]
+	fetcher = _fetcher(increase=0.0)
+
+	async with httpx.AsyncClient() as client:
+		started = time.monotonic()
+		resp = await fetcher.get(client, f"{base}/throttled")
+		elapsed = time.monotonic() - started
+
+	assert resp.status_code == 200
+	assert handler.hits["/throttled"] == 2
+	assert elapsed >= 0.4
+	metrics = _host_metrics(fetcher)
+	assert metrics["throttled"] == 1
+	assert metrics["retries"] == 1
+	assert metrics["rate"] == pytest.approx(50)
+	assert metrics["circuit"] == "closed"
+
+
+@pytest.mark.anyio
+async def test_server_errors_are_retried_until_success(server):
+	base, handler = server
+	handler.scripts["/flaky"] = [(500, {}), (502, {}), (200, {})]
+	fetcher = _fetcher()
+
+	async with httpx.AsyncClient() as client:
+		resp = await fetcher.get(client, f"{base}/flaky")
+
+	assert resp.status_code == 200
+	metrics = _host_metrics(fetcher)
+	assert metrics["server_errors"] == 2
+	assert metrics["retries"] == 2
+	assert metrics["successes"] == 1
+
+
+@pytest.mark.anyio
+async def test_retries_stop_after_max_attempts(server):
+	base, handler = server
+	handler.scripts["/down"] = [(503, {})]
+	fetcher = _fetcher(max_attempts=3, failure_threshold=10)
+
+	async with httpx.AsyncClient() as client:
+		with pytest.raises(FetchError) as excinfo:
+			await fetcher.get(client, f"{base}/down")
+
+	assert excinfo.value.status_code == 503
+	assert handler.hits["/down"] == 3
+
+
+@pytest.mark.anyio
+async def test_client_errors_are_returned_without_retry(server):
+	base, handler = server
+	fetcher = _fetcher()
+
+	async with httpx.AsyncClient() as client:
+		resp = await fetcher.get(client, f"{base}/missing")
+
+	assert resp.status_code == 404
+	assert handler.hits["/missing"] == 1
+	assert _host_metrics(fetcher)["retries"] == 0
+
+
+@pytest.mark.anyio
+async def test_circuit_opens_then_recovers_after_probe(server):
+	base, handler = server
+	handler.scripts["/down"] = [(500, {})]
+	handler.scripts["/up"] = [(200, {})]
+	fetcher = _fetcher(max_attempts=1, failure_threshold=2, reset_timeout=0.3)
+
+	async with httpx.AsyncClient() as client:
+		for _ in range(2):
+			with pytest.raises(FetchError):
+				await fetcher.get(client, f"{base}/down")
+		assert _host_metrics(fetcher)["circuit"] == "open"
+
+		# The open circuit refuses requests without reaching the server
+		with pytest.raises(CircuitOpenError):
+			await fetcher.get(client, f"{base}/up")
+		assert "/up" not in handler.hits
+		assert _host_metrics(fetcher)["rejected"] == 1
+
+		await anyio.sleep(0.35)
+		assert _host_metrics(fetcher)["circuit"] == "half-open"
+		resp = await fetcher.get(client, f"{base}/up")
+
+	assert resp.status_code == 200
+	assert _host_metrics(fetcher)["circuit"] == "closed"
+
+
+@pytest.mark.anyio
+async def test_throttling_does_not_open_circuit(server):
+	base, handler = server
+	handler.scripts["/busy"] = [(429, {"Retry-After": "0"})] * 3 + [(200, {})]
+	fetcher = _fetcher(max_attempts=4, failure_threshold=1)
+
+	async with httpx.AsyncClient() as client:
+		resp = await fetcher.get(client, f"{base}/busy")
+
+	assert resp.status_code == 200
+	metrics = _host_metrics(fetcher)
+	assert metrics["throttled"] == 3
+	assert metrics["circuit"] == "closed"
+
+
+async def _open_circuit(fetcher: Fetcher, base: str) -> None:
+	async with httpx.AsyncClient() as client:
+		for _ in range(2):
+			with pytest.raises(FetchError):
+				await fetcher.get(client, f"{base}/down")
+	await anyio.sleep(0.35)
+	assert _host_metrics(fetcher)["circuit"] == "half-open"
+
+
+@pytest.mark.anyio
+async def test_cancelled_probe_frees_the_half_open_slot(server):
+	base, handler = server
+	handler.scripts["/down"] = [(500, {})]
+	handler.scripts["/up"] = [(200, {})]
+	fetcher = _fetcher(max_attempts=1, failure_threshold=2, reset_timeout=0.3)
+	await _open_circuit(fetcher, base)
+
+	async def hang(request: httpx.Request) -> httpx.Response:
+		await anyio.sleep(10)
+		return httpx.Response(200)
+
+	async with httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client:
+		with anyio.move_on_after(0.05):
+			await fetcher.get(client, f"{base}/up")
+	assert _host_metrics(fetcher)["circuit"] == "half-open"
+
+	async with httpx.AsyncClient() as client:
+		resp = await fetcher.get(client, f"{base}/up")
+	assert resp.status_code == 200
+	assert _host_metrics(fetcher)["circuit"] == "closed"
+
+
+@pytest.mark.anyio
+async def test_unexpected_error_in_probe_reopens_circuit(server):
+	base, handler = server
+	handler.scripts["/down"] = [(500, {})]
+	fetcher = _fetcher(max_attempts=1, failure_threshold=2, reset_timeout=0.3)
+	await _open_circuit(fetcher, base)
+
+	def broken(request: httpx.Request) -> httpx.Response:
+		raise ValueError("bad response")
+
+	async with httpx.AsyncClient(transport=httpx.MockTransport(broken)) as client:
+		with pytest.raises(ValueError):
+			await fetcher.get(client, f"{base}/up")
+		assert _host_metrics(fetcher)["circuit"] == "open"
+		with pytest.raises(CircuitOpenError):
+			await fetcher.get(client, f"{base}/up")
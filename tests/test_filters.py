@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import random
+from typing import List
+
+from absearch.filters import FilterIndex, filter_records
+from absearch.models import AntibodyRecord, Criteria, RecordDraft
+
+
+_SPECIES = ["Human", "Mouse", "Rat", "Monkey"]
+_HOSTS = ["Rabbit", "Mouse", "Goat"]
+_APPS = ["WB", "IHC-P", "ICC/IF", "Flow Cytometry", "IP", "ELISA"]
+_CONJ = ["HRP", "Alexa488", "FITC"]
+
+
+def _records(count: int, seed: int = 0) -> List[RecordDraft]:
+	rnd = random.Random(seed)
+	return [
+		RecordDraft(
+			vendor=rnd.choice(["Abcam", "MockVendor"]),
+			catalog_number=f"ab{i}",
+			name=f"Antibody {i}",
+			target="TP53",
+			host_species=rnd.choice(_HOSTS + [h.lower() for h in _HOSTS] + [None]),
+			clonality=rnd.choice(["Monoclonal", "polyclonal", None]),
+			applications=rnd.sample(_APPS, rnd.randint(0, 3)),
+			validated_reactivity=rnd.sample(_SPECIES, rnd.randint(0, 2)),
+			conjugation=rnd.choice(_CONJ + [None, None]),
+			price=rnd.choice([None, 200.0, 400.0, round(rnd.uniform(150, 700), 2)]),
+			citations_count=rnd.choice([None, 0, 10, rnd.randint(0, 300)]),
+			amount_ug=rnd.choice([None, 10, 25, 100]),
+			concentration_mg_per_ml=rnd.choice([None, 0.5, 1.0]),
+			volume_ul=rnd.choice([None, 50, 100]),
+		)
+		for i in range(count)
+	]
+
+
+def _criteria(count: int, seed: int = 1) -> List[Criteria]:
+	rnd = random.Random(seed)
+	criteria = [Criteria()]
+	for _ in range(count):
+		criteria.append(Criteria(
+			species_reactivity=rnd.choice([None, rnd.sample(_SPECIES + ["human", "Dog"], 2)]),
+			host_species=rnd.choice([None, rnd.sample(_HOSTS + ["rabbit"], 1)]),
+			clonality=rnd.choice([None, ["monoclonal"], ["Polyclonal"]]),
+			applications=rnd.choice([None, rnd.sample(_APPS + ["wb", "ChIP"], rnd.randint(1, 2))]),
+			conjugation=rnd.choice([None, rnd.sample(_CONJ, 1)]),
+			min_citations=rnd.choice([None, 0, 10, 50]),
+			max_price=rnd.choice([None, 200.0, 400.0, 600.0]),
+			min_amount_ug=rnd.choice([None, 10.0, 25.0, 50.0]),
+		))
+	return criteria
+
+
+def test_filter_index_matches_filter_records():
+	records = _records(400)
+	index = FilterIndex(records)
+	for criteria in _criteria(200):
+		assert index.filter(criteria) == filter_records(records, criteria), criteria
+
+
+def test_filter_index_matches_filter_records_on_validated_records():
+	records = [r.to_record() for r in _records(100, seed=2)]
+	assert all(isinstance(r, AntibodyRecord) for r in records)
+	index = FilterIndex(records)
+	for criteria in _criteria(50, seed=3):
+		assert index.filter(criteria) == filter_records(records, criteria), criteria
+
+
+def test_filter_index_on_empty_result_set():
+	index = FilterIndex([])
+	assert len(index) == 0
+	assert index.filter(Criteria(applications=["WB"])) == []
+	assert index.filter(Criteria()) == []
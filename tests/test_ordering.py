@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+import re
+from typing import List
+
+import pytest
+
+from absearch.models import RecordDraft
+from absearch.ordering import (
+	_PHRASE_SYNONYMS,
+	TopK,
+	normalize_applications,
+	priority_key,
+	sort_records_by_priority,
+	top_k_by_priority,
+)
+
+
+_APPLICATIONS = [
+	"Western blot", "WB", "IHC-P", "IHC-Fr", "IHC", "Immunohistochemistry", "ICC/IF", "ICC", "IF-ICC",
+	"Immunocytochemistry", "Flow Cyt (Intra)", "Flow cytometry, intracellular", "flow cytometry (intracellular)",
+	"Flow Cytometry", "FACS", "FCM", "IP", "Immunoprecipitation", "ELISA", "Sandwich ELISA", "competitive elisa",
+	"ChIP-seq", "ChIP", "RIP", "Dot blot", "Immunofluorescence", "IF", "permeabilized flow", "intracellular flow",
+	"ICFC", "foo", "WB/IP", "IHC,ICC", "xWB", "WBx", "IF-ICC/IHC-P", "icc / if", "  ", "", "ihcp", "ChIP-Seq-x",
+]
+
+
+def _per_phrase_codes(apps: List[str]) -> List[str]:
+	"""The original normalizer: every phrase searched in the text, then fullmatched against each token."""
+	codes: List[str] = []
+	for app in apps:
+		text = (app or "").strip()
+		if not text:
+			continue
+		for pat, code in _PHRASE_SYNONYMS:
+			if pat.search(text):
+				codes.append(code)
+		for token in re.split(r"[\s,\/]+", text):
+			token = token.strip()
+			if not token:
+				continue
+			for pat, code in _PHRASE_SYNONYMS:
+				if pat.fullmatch(token):
+					codes.append(code)
+	return list(dict.fromkeys(codes))
+
+
+@pytest.mark.parametrize("app", _APPLICATIONS)
+def test_normalizer_matches_per_phrase_loop_on_single_applications(app):
+	assert normalize_applications([app]) == _per_phrase_codes([app])
+
+
+def test_normalizer_matches_per_phrase_loop_on_mixed_lists():
+	rnd = random.Random(0)
+	for _ in range(2000):
+		apps = [
+			rnd.choice([" ", ", ", "/", " and ", ";", "-"]).join(rnd.sample(_APPLICATIONS, rnd.randint(1, 3)))
+			for _ in range(rnd.randint(0, 4))
+		]
+		assert normalize_applications(apps) == _per_phrase_codes(apps), apps
+
+
+def _records(count: int, seed: int = 0) -> List[RecordDraft]:
+	"""Records with few distinct values per field, so priority keys tie often."""
+	rnd = random.Random(seed)
+	return [
+		RecordDraft(
+			vendor=rnd.choice(["Abcam", "MockVendor"]),
+			catalog_number=rnd.choice([f"ab{i}", "ab1"]),
+			name=f"Antibody {i}",
+			target="TP53",
+			applications=rnd.sample(["WB", "IHC-P", "ICC/IF", "Flow Cyt (Intra)", "ELISA"], rnd.randint(0, 2)),
+			is_bsa_free=rnd.choice([None, True, False]),
+			price=rnd.choice([None, 250.0, 400.0]),
+			citations_count=rnd.choice([None, 0, 12]),
+		)
+		for i in range(count)
+	]
+
+
+@pytest.mark.parametrize("k", [0, 1, 7, 50, 300, 301, 500])
+def test_top_k_matches_sort_then_slice(k):
+	records = _records(300)
+	expected = sort_records_by_priority(records)[:k]
+	assert [id(r) for r in top_k_by_priority(records, k)] == [id(r) for r in expected]
+
+
+def test_top_k_can_enter_agrees_with_push():
+	top = TopK(5)
+	for r in _records(200, seed=1):
+		admitted = top.can_enter(priority_key(r))
+		assert top.push(r) == admitted
+	assert len(top) == 5
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from absearch.parsing import body_hash
+from absearch.providers import abcam
+from absearch.providers.abcam import AbcamProvider
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+_BACKENDS = ["html.parser"] + (["lxml"] if importlib.util.find_spec("lxml") is not None else [])
+
+
+def _parsed(html: str, target: str) -> List[Dict[str, object]]:
+	return [draft.to_record().model_dump(mode="json") for draft in AbcamProvider()._parse_listings(html, target)]
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
+def test_parse_listings_matches_saved_fixture(monkeypatch, backend):
+	monkeypatch.setattr(abcam, "_PARSER_BACKEND", backend)
+	html = (FIXTURES / "abcam_listing.html").read_text(encoding="utf-8")
+	expected = json.loads((FIXTURES / "abcam_listing.expected.json").read_text(encoding="utf-8"))
+
+	assert _parsed(html, "TP53") == expected
+
+
+def test_parse_listings_skips_known_catalog_numbers():
+	html = (FIXTURES / "abcam_listing.html").read_text(encoding="utf-8")
+	expected = json.loads((FIXTURES / "abcam_listing.expected.json").read_text(encoding="utf-8"))
+	drafts = AbcamProvider()._parse_listings(html, "TP53", known=frozenset({"ab32389", "ab1101"}))
+
+	assert [draft.catalog_number for draft in drafts] == [
+		record["catalog_number"] for record in expected if record["catalog_number"] not in ("ab32389", "ab1101")
+	]
+
+
+@pytest.mark.anyio
+async def test_partial_parse_is_cached_for_lookups_that_cover_it():
+	html = (FIXTURES / "abcam_listing.html").read_text(encoding="utf-8")
+	provider = AbcamProvider()
+	digest = body_hash(html)
+	known = frozenset({"ab32389", "ab1101"})
+
+	partial = await provider._aparse_listing(html, "TP53", digest, known)
+	assert "ab32389" not in {r.catalog_number for r in partial}
+	assert provider._parse_cache.get(digest, "TP53", known | {"ab16665"}) is not None
+	# The skipped cards are missing from the cached parse, so an empty known set parses again
+	assert provider._parse_cache.get(digest, "TP53") is None
+
+	full = await provider._aparse_listing(html, "TP53", digest, frozenset())
+	assert {r.catalog_number for r in full} >= {"ab32389", "ab1101"}
+	assert provider._parse_cache.get(digest, "TP53") is not None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import httpx
+import pytest
+
+from absearch.catalog import CatalogStore
+from absearch.fetch import Fetcher
+from absearch.providers.abcam import AbcamProvider
+from absearch.refresh import refresh_many_sync
+
+
+DETAIL = (
+	"<html><body><h1>ab1001</h1><p>Concentration 0.5 mg/ml</p>"
+	"<ul><li>100 µl $450.00</li></ul><p>Cited in 87 publications</p></body></html>"
+)
+
+
+@pytest.fixture
+def site() -> Dict[str, object]:
+	return {"name": "Anti-TP53 antibody [E1]", "detail": True}
+
+
+def _provider(site: Dict[str, object]) -> AbcamProvider:
+	def handler(request: httpx.Request) -> httpx.Response:
+		if "keywords" in request.url.params:
+			card = f'<div class="card"><a href="/products/ab1001">{site["name"]} ab1001</a> Rabbit monoclonal Human WB</div>'
+			return httpx.Response(200, text=f"<html><body>{card}</body></html>")
+		if site["detail"]:
+			return httpx.Response(200, text=DETAIL)
+		return httpx.Response(404)
+
+	return AbcamProvider(
+		async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+		fetcher=Fetcher(rate=1000, burst=1000, max_rate=1000, max_attempts=1),
+	)
+
+
+def _stored(store: CatalogStore):
+	return store.records([("Abcam", "ab1001")])[("Abcam", "ab1001")]
+
+
+@pytest.mark.parametrize("enrich, detail", [(False, True), (True, False)], ids=["no-enrich", "detail-page-fails"])
+def test_changed_record_keeps_enriched_fields(tmp_path, site, enrich, detail):
+	store = CatalogStore(str(tmp_path / "catalog.sqlite3"))
+	refresh_many_sync(store, ["TP53"], [_provider(site)])
+	assert _stored(store).price == 450.0
+
+	site["name"] = "Anti-TP53 antibody [E1] (renamed)"
+	site["detail"] = detail
+	delta = refresh_many_sync(store, ["TP53"], [_provider(site)], enrich=enrich)["TP53"]
+
+	assert [r.catalog_number for r in delta.changed] == ["ab1001"]
+	record = _stored(store)
+	assert record.name.startswith("Anti-TP53 antibody [E1] (renamed)")
+	assert record.price == 450.0
+	assert record.citations_count == 87
+	assert len(record.package_options) == 1
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import List
+
+import anyio
+import pytest
+
+from absearch.models import RecordDraft
+from absearch.search import search_many_sync
+
+
+def _record(target: str) -> RecordDraft:
+	return RecordDraft(vendor="Test", catalog_number=f"T-{target}", name=f"Anti-{target}", target=target)
+
+
+class _SyncProvider:
+	name = "sync"
+
+	def __init__(self) -> None:
+		self.calls = 0
+
+	def search(self, target: str) -> List[RecordDraft]:
+		self.calls += 1
+		return [_record(target)]
+
+
+class _AsyncProvider(_SyncProvider):
+	name = "async"
+
+	async def asearch(self, target: str) -> List[RecordDraft]:
+		self.calls += 1
+		await anyio.sleep(0)
+		return [_record(target)]
+
+
+class _StreamProvider(_SyncProvider):
+	name = "stream"
+
+	async def astream(self, target: str, send) -> None:
+		self.calls += 1
+		await send.send(_record(target))
+
+
+class _FailingProvider:
+	name = "failing"
+
+	async def asearch(self, target: str) -> List[RecordDraft]:
+		raise RuntimeError("vendor down")
+
+
+def _closed_pipe(record: RecordDraft) -> None:
+	raise BrokenPipeError(32, "Broken pipe")
+
+
+@pytest.mark.parametrize("provider_cls", [_SyncProvider, _AsyncProvider, _StreamProvider])
+def test_sink_error_propagates_and_stops_the_search(provider_cls):
+	provider = provider_cls()
+	targets = [f"T{i}" for i in range(100)]
+
+	with pytest.raises(BrokenPipeError):
+		search_many_sync(targets, providers=[provider], max_concurrency=2, on_record=_closed_pipe)
+
+	assert provider.calls < len(targets)
+
+
+def test_provider_error_becomes_status():
+	results = search_many_sync(["TP53"], providers=[_FailingProvider(), _AsyncProvider()])
+
+	assert results["TP53"].provider_status == {"failing": "error: RuntimeError: vendor down", "async": "ok"}
+	assert [r.catalog_number for r in results["TP53"].records] == ["T-TP53"]